@@ -1,10 +1,39 @@
 #!/usr/bin/env python3
 # abi_impact_analyzer.py - ABI影响分析
 
+from collections import Counter
+
+def _build_struct_abi_table():
+    """预先计算字段变化掩码 (removed<<2 | modified<<1 | added) 对应的 (严重性, 原因)"""
+    table = []
+    for mask in range(8):
+        reasons = []
+        # 删除字段总是破坏ABI
+        if mask & 4:
+            reasons.append('Fields removed')
+        # 字段重排序可能破坏ABI
+        if mask & 2:
+            reasons.append('Fields reordered')
+        # 简化判断：任何字段添加都可能影响ABI
+        if mask & 1:
+            reasons.append('Fields added (potential ABI break)')
+        table.append(('high' if mask & 4 else 'medium', tuple(reasons)) if reasons else None)
+    return tuple(table)
+
+_STRUCT_ABI_TABLE = _build_struct_abi_table()
+
 class ABIImpactAnalyzer:
     def __init__(self, api_changes):
         self.api_changes = api_changes
-        self.abi_breaking_changes = []
+        # 按类别分别记录，报告中结构体影响总在函数影响之前，与遍历顺序无关
+        self._impacts = {'structs': [], 'functions': []}
+        # 与 abi_breaking_changes 并行维护的严重性计数，生成报告时无需再扫描
+        self.severity_counts = Counter()
+        
+    @property
+    def abi_breaking_changes(self):
+        """全部ABI破坏性变化：结构体在前，函数在后"""
+        return self._impacts['structs'] + self._impacts['functions']
     
     def analyze_abi_impact(self):
         """分析ABI兼容性影响"""
@@ -12,47 +41,50 @@ class ABIImpactAnalyzer:
         
         # 检查结构体布局变化
         for struct in self.api_changes.get('structs', []):
-            if struct['change_type'] == 'modified':
-                impact = self._analyze_struct_abi_impact(struct)
-                if impact:
-                    self.abi_breaking_changes.append(impact)
+            self.visit('structs', struct)
         
         # 检查函数签名变化
         for func in self.api_changes.get('functions', []):
-            if func['change_type'] == 'modified':
-                impact = self._analyze_function_abi_impact(func)
-                if impact:
-                    self.abi_breaking_changes.append(impact)
+            self.visit('functions', func)
         
         return self.abi_breaking_changes
     
+    def visit(self, category, change):
+        """分析单条变化的ABI影响（可与其他分析器共享同一次遍历）"""
+        if change['change_type'] != 'modified':
+            return
+        
+        if category == 'structs':
+            impact = self._analyze_struct_abi_impact(change)
+        elif category == 'functions':
+            impact = self._analyze_function_abi_impact(change)
+        else:
+            return
+        
+        if impact:
+            self._record(category, impact)
+    
+    def _record(self, category, impact):
+        """记录一条ABI破坏性变化"""
+        self._impacts[category].append(impact)
+        self.severity_counts[impact['severity']] += 1
+    
     def _analyze_struct_abi_impact(self, struct):
         """分析结构体的ABI影响"""
         fc = struct.get('field_changes', {})
         
-        # ABI破坏性变化
-        breaking_reasons = []
+        # 以 removed/modified/added 三位掩码查表得到严重性和原因
+        mask = (bool(fc.get('removed')) << 2) | (bool(fc.get('modified')) << 1) | bool(fc.get('added'))
+        entry = _STRUCT_ABI_TABLE[mask]
         
-        # 删除字段总是破坏ABI
-        if fc.get('removed'):
-            breaking_reasons.append('Fields removed')
-        
-        # 字段重排序可能破坏ABI
-        if fc.get('modified'):
-            breaking_reasons.append('Fields reordered')
-        
-        # 在中间添加字段破坏ABI
-        if fc.get('added'):
-            # 简化判断：任何字段添加都可能影响ABI
-            breaking_reasons.append('Fields added (potential ABI break)')
-        
-        if breaking_reasons:
+        if entry:
+            severity, breaking_reasons = entry
             return {
                 'type': 'structure',
                 'name': struct['name'],
                 'file': struct['file'],
-                'severity': 'high' if fc.get('removed') else 'medium',
-                'reasons': breaking_reasons,
+                'severity': severity,
+                'reasons': list(breaking_reasons),
                 'recommendation': 'Review all users of this structure'
             }
         
@@ -92,11 +124,12 @@ class ABIImpactAnalyzer:
     
     def generate_abi_report(self):
         """生成ABI影响报告"""
+        changes = self.abi_breaking_changes
         report = {
-            'total_breaking_changes': len(self.abi_breaking_changes),
-            'high_severity': len([c for c in self.abi_breaking_changes if c['severity'] == 'high']),
-            'medium_severity': len([c for c in self.abi_breaking_changes if c['severity'] == 'medium']),
-            'changes': self.abi_breaking_changes
+            'total_breaking_changes': len(changes),
+            'high_severity': self.severity_counts['high'],
+            'medium_severity': self.severity_counts['medium'],
+            'changes': changes
         }
         
         return report
\ No newline at end of file
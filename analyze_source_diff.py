@@ -1,38 +1,102 @@
 #!/usr/bin/env python3
 # analyze_source_diff.py - 分析源码级别的差异
 
+import mmap
+import os
 import re
 import subprocess
+import sys
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional
 
-@dataclass
-class FunctionChange:
-    name: str
-    old_signature: str
-    new_signature: str
-    param_changes: List[Dict]
-    return_type_changed: bool
-    file: str
-    old_line: int
-    new_line: int
+_WS_RE = re.compile(r'\s+')
+_PAREN_RE = re.compile(r'\((.*?)\)')
+# 已合并空白的参数：最后一个空格前为类型，之后为（可带前导 '*' 的）名称
+_PARAM_RE = re.compile(r'(.*) (\*?)\**(.*)')
+# '{' 通过捕获组区分，计数时无需取出匹配的子串
+_BRACE_RE = re.compile(r'(\{)|\}')
+# 结构体体内每个含 ';' 的行：捕获第一个 ';' 之前的内容，跳过 '//' 注释行
+_FIELD_RE = re.compile(r'^(?![^\S\n]*//)[^\S\n]*([^;\n]*);', re.MULTILINE)
+_NEWLINE_RE = re.compile(rb'\n')
 
-@dataclass
-class StructChange:
-    name: str
-    added_fields: List[str]
-    removed_fields: List[str]
-    modified_fields: List[Dict]
-    file: str
+@lru_cache(maxsize=64)
+def _line_index(file_path):
+    """映射源文件并建立行首偏移索引（每个文件只建立一次）"""
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件无法映射
+            return b'', array('Q', [0])
+    offsets = array('Q', [0])
+    offsets.extend(m.end() for m in _NEWLINE_RE.finditer(mm))
+    return mm, offsets
+
+def _line_slice(file_path, start, stop):
+    """返回第 [start, stop) 行（从0开始）的原始字节，不加载整个文件"""
+    mm, offsets = _line_index(file_path)
+    if start >= len(offsets):
+        return b''
+    end = offsets[stop] if stop < len(offsets) else len(mm)
+    return mm[offsets[start]:end]
+
+def _read_line_range(file_path, start, stop):
+    """读取第 [start, stop) 行（从0开始）的文本"""
+    return _line_slice(file_path, start, stop).decode('utf-8', errors='ignore')
+
+@dataclass(slots=True, eq=False)
+class ChangeRecord(Mapping):
+    """单条变更记录：slots 存储，同时保留只读的字典接口（值为 None 的字段视为不存在）
     
-@dataclass
-class MacroChange:
+    只有数据类字段可以按键访问；相等比较沿用 Mapping 语义，记录与等价的字典相等
+    """
     name: str
-    old_definition: str
-    new_definition: str
-    semantic_change: str
+    change_type: str
     file: str
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
+        self.file = sys.intern(self.file)
+        
+    def __getitem__(self, key):
+        if key in self.__dataclass_fields__:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+        
+    def __iter__(self):
+        return (key for key in self.__dataclass_fields__ if getattr(self, key) is not None)
+        
+    def __len__(self):
+        return sum(1 for _ in self)
+
+@dataclass(slots=True, eq=False)
+class FunctionChange(ChangeRecord):
+    line: Optional[int] = None
+    signature: Optional[str] = None
+    old_signature: Optional[str] = None
+    new_signature: Optional[str] = None
+    old_line: Optional[int] = None
+    new_line: Optional[int] = None
+    return_type_changed: Optional[bool] = None
+    old_return_type: Optional[str] = None
+    new_return_type: Optional[str] = None
+    parameter_changes: Optional[List[Dict]] = None
+
+@dataclass(slots=True, eq=False)
+class StructChange(ChangeRecord):
+    field_changes: Optional[Dict] = None
+    
+@dataclass(slots=True, eq=False)
+class MacroChange(ChangeRecord):
+    old_definition: Optional[str] = None
+    new_definition: Optional[str] = None
 
 class SourceDiffAnalyzer:
     def __init__(self, old_kernel, new_kernel):
@@ -42,37 +106,46 @@ class SourceDiffAnalyzer:
     def extract_function_signature(self, file_path, function_name, line_num):
         """从源文件提取完整函数签名"""
         try:
-            with open(file_path, 'r', errors='ignore') as f:
-                lines = f.readlines()
-                
-            # 从函数定义行开始，找到完整签名
-            signature_lines = []
-            brace_count = 0
-            found_brace = False
+            blob = _line_slice(file_path, max(0, line_num - 1), line_num + 20)
             
-            for i in range(max(0, line_num - 1), min(len(lines), line_num + 20)):
-                line = lines[i].strip()
-                signature_lines.append(line)
+            # 从函数定义行开始，签名到第一个 '{'（定义）或 ';'（声明）所在行为止
+            stops = [pos for pos in (blob.find(b'{'), blob.find(b';')) if pos >= 0]
+            if stops:
+                line_end = blob.find(b'\n', min(stops))
+                if line_end >= 0:
+                    blob = blob[:line_end]
+            brace = blob.find(b'{')
+            if brace >= 0:
+                blob = blob[:brace]
                 
-                if '{' in line:
-                    found_brace = True
-                    break
-                if ';' in line:  # 函数声明
-                    break
-                    
-            signature = ' '.join(signature_lines)
-            # 清理签名
-            signature = re.sub(r'\s+', ' ', signature)
-            signature = signature.split('{')[0].strip()
-            
-            return signature
+            # 清理签名：合并所有空白
+            return ' '.join(blob.decode('utf-8', errors='ignore').split())
         except Exception as e:
             return ""
             
+    def extract_signatures_bulk(self, file_path, requests):
+        """批量提取同一文件中多个函数的签名，文件只映射一次
+        
+        requests: [(function_name, line_num), ...]
+        返回: {function_name: signature}
+        """
+        return {
+            name: self.extract_function_signature(file_path, name, line_num)
+            for name, line_num in requests
+        }
+        
+    def extract_signatures_parallel(self, requests, max_workers=None):
+        """按文件分组并行提取函数签名
+        
+        requests: [(file_path, function_name, line_num), ...]
+        返回: {file_path: {function_name: signature}}
+        """
+        return self.extract_sources_parallel(requests, [], max_workers)[0]
+            
     def parse_function_parameters(self, signature):
         """解析函数参数"""
         # 提取参数部分
-        match = re.search(r'\((.*?)\)', signature)
+        match = _PAREN_RE.search(signature)
         if not match:
             return []
             
@@ -103,23 +176,23 @@ class SourceDiffAnalyzer:
     def _parse_single_param(self, param):
         """解析单个参数"""
         # 移除多余空格
-        param = re.sub(r'\s+', ' ', param.strip())
+        param = _WS_RE.sub(' ', param.strip())
         
         # 尝试分离类型和名称
-        parts = param.rsplit(None, 1)
-        if len(parts) == 2:
-            param_type, param_name = parts
+        match = _PARAM_RE.fullmatch(param)
+        if match:
+            param_type, pointer, param_name = match.groups()
             # 处理指针
-            if param_name.startswith('*'):
+            if pointer:
                 param_type += ' *'
-                param_name = param_name.lstrip('*')
         else:
             param_type = param
             param_name = ''
             
+        # 驻留类型和名称字符串，比较时可走身份比较快速路径
         return {
-            'type': param_type.strip(),
-            'name': param_name.strip(),
+            'type': sys.intern(param_type.strip()),
+            'name': sys.intern(param_name.strip()),
             'full': param
         }
         
@@ -136,10 +209,10 @@ class SourceDiffAnalyzer:
             })
             
         # 逐个比较参数
-        for i in range(min(len(old_params), len(new_params))):
-            old_p = old_params[i]
-            new_p = new_params[i]
-            
+        for i, (old_p, new_p) in enumerate(zip(old_params, new_params)):
+            if old_p['type'] is new_p['type'] and old_p.get('name') is new_p.get('name'):
+                continue
+                
             if old_p['type'] != new_p['type']:
                 changes.append({
                     'type': 'param_type_change',
@@ -180,44 +253,118 @@ class SourceDiffAnalyzer:
     def extract_struct_fields(self, file_path, struct_name, line_num):
         """提取结构体字段"""
         try:
-            with open(file_path, 'r', errors='ignore') as f:
-                lines = f.readlines()
-                
-            fields = []
-            in_struct = False
-            brace_count = 0
+            text = _read_line_range(file_path, max(0, line_num - 1), line_num + 500)
             
-            for i in range(max(0, line_num - 1), min(len(lines), line_num + 500)):
-                line = lines[i].strip()
+            # 定位结构体定义行
+            header = re.search(
+                r'\bstruct[ \t]+' + re.escape(struct_name) + r'\b[^\n;]*\{', text
+            )
+            if not header:
+                return []
+            body_start = text.find('\n', header.end()) + 1
+            if body_start == 0:
+                return []
                 
-                if 'struct' in line and struct_name in line and '{' in line:
-                    in_struct = True
-                    brace_count = 1
-                    continue
+            # 匹配花括号，找到结构体结束所在行
+            body_end = len(text)
+            brace_count = 1
+            for brace in _BRACE_RE.finditer(text, body_start):
+                brace_count += 1 if brace.lastindex else -1
+                if brace_count == 0:
+                    body_end = text.rfind('\n', 0, brace.start()) + 1
+                    break
                     
-                if in_struct:
-                    brace_count += line.count('{') - line.count('}')
+            # 解析字段
+            fields = []
+            for match in _FIELD_RE.finditer(text, body_start, body_end):
+                field = match.group(1).strip()
+                if field and not field.startswith('/*'):
+                    fields.append(sys.intern(field))
                     
-                    if brace_count == 0:
-                        break
-                        
-                    # 解析字段
-                    if ';' in line and not line.startswith('//'):
-                        field = line.split(';')[0].strip()
-                        if field and not field.startswith('/*'):
-                            fields.append(field)
-                            
             return fields
         except Exception as e:
             return []
             
+    def extract_struct_fields_bulk(self, file_path, requests):
+        """批量提取同一文件中多个结构体的字段，文件只映射一次
+        
+        requests: [(struct_name, line_num), ...]
+        返回: {struct_name: fields}
+        """
+        return {
+            name: self.extract_struct_fields(file_path, name, line_num)
+            for name, line_num in requests
+        }
+        
+    def extract_struct_fields_parallel(self, requests, max_workers=None):
+        """按文件分组并行提取结构体字段
+        
+        requests: [(file_path, struct_name, line_num), ...]
+        返回: {file_path: {struct_name: fields}}
+        """
+        return self.extract_sources_parallel([], requests, max_workers)[1]
+        
+    def _extract_sources_group(self, group):
+        """进程池工作函数：在同一任务中处理一个文件的签名与字段请求"""
+        file_path, (signature_requests, struct_requests) = group
+        return file_path, (self.extract_signatures_bulk(file_path, signature_requests),
+                           self.extract_struct_fields_bulk(file_path, struct_requests))
+        
+    def extract_sources_parallel(self, signature_requests, struct_requests, max_workers=None):
+        """把函数签名与结构体字段请求按文件合并分组后并行提取
+        
+        同一头文件的两类请求落在同一个任务里，文件只映射、索引一次
+        （进程池中各 worker 的 _line_index 缓存随池销毁，分两轮提取会重复建立）
+        
+        signature_requests / struct_requests: [(file_path, name, line_num), ...]
+        返回: (signatures, fields)，均为 {file_path: {name: 结果}}
+        """
+        groups = defaultdict(lambda: ([], []))
+        for file_path, name, line_num in signature_requests:
+            groups[file_path][0].append((name, line_num))
+        for file_path, name, line_num in struct_requests:
+            groups[file_path][1].append((name, line_num))
+            
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(groups) < 2:
+            results = map(self._extract_sources_group, groups.items())
+            return self._split_sources(results)
+            
+        chunksize = max(1, len(groups) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(self._extract_sources_group, groups.items(), chunksize=chunksize)
+            return self._split_sources(results, reintern=True)
+            
+    def _split_sources(self, results, reintern=False):
+        """把 (file_path, (签名, 字段)) 结果拆成两个按文件索引的字典
+        
+        reintern: 结果来自子进程时，pickle 传回的字段不再是驻留字符串，
+        重新驻留以保证新旧字段列表的相等比较仍是逐元素的同一性比较
+        """
+        signatures, fields = {}, {}
+        for file_path, (file_signatures, file_fields) in results:
+            if file_signatures:
+                signatures[file_path] = file_signatures
+            if file_fields:
+                if reintern:
+                    intern = sys.intern
+                    file_fields = {name: [intern(field) for field in struct_fields]
+                                   for name, struct_fields in file_fields.items()}
+                fields[file_path] = file_fields
+        return signatures, fields
+            
     def compare_struct_fields(self, old_fields, new_fields):
         """比较结构体字段变化"""
+        # 字段在提取时已驻留，相同的结构体可直接通过身份比较快速跳过
+        if old_fields == new_fields:
+            return {'added': [], 'removed': [], 'modified': []}
+            
         old_set = set(old_fields)
         new_set = set(new_fields)
         
-        added = list(new_set - old_set)
-        removed = list(old_set - new_set)
+        # 保持源码中的字段顺序（去重）
+        added = [f for f in dict.fromkeys(new_fields) if f not in old_set]
+        removed = [f for f in dict.fromkeys(old_fields) if f not in new_set]
         
         # 检查字段修改（位置或类型变化）
         modified = []
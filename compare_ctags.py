@@ -18,9 +18,30 @@ ctags -R -o tags_v6.1.json --output-format=json --fields=+nS \
 
 import json
 import argparse
+import heapq
+import os
 import sys
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 
+# orjson parses bytes directly and is much faster on large ctags dumps;
+# fall back to the standard library when it is not installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+
+# Pseudo-tag (metadata) line prefixes, as emitted with and without separator spaces
+_PTAG_PREFIXES = (b'{"_type": "ptag"', b'{"_type":"ptag"')
+
 def parse_ctags_json(filepath):
     """
     Parses a ctags JSON-lines file into a dictionary of symbols.
@@ -31,12 +52,15 @@ def parse_ctags_json(filepath):
     symbols = {}
     print(f"[+] Parsing {filepath}...", file=sys.stderr)
     try:
-        with open(filepath, 'r') as f:
+        with open(filepath, 'rb', buffering=1 << 20) as f:
             for line in f:
+                # Skip pseudo-tags before paying for a JSON parse
+                if line.startswith(_PTAG_PREFIXES):
+                    continue
                 try:
-                    tag = json.loads(line)
-                except json.JSONDecodeError:
-                    print(f"   - Warning: Skipping malformed JSON line: {line.strip()}", file=sys.stderr)
+                    tag = _json_loads(line)
+                except ValueError:
+                    print(f"   - Warning: Skipping malformed JSON line: {line.decode(errors='replace').strip()}", file=sys.stderr)
                     continue
 
                 # We only care about actual tags, not pseudo-tags (metadata)
@@ -73,6 +97,10 @@ def parse_ctags_json(filepath):
     except Exception as e:
         print(f"[!] Error parsing file {filepath}: {e}", file=sys.stderr)
         sys.exit(1)
+
+    # Derive comparison fields once per surviving tag
+    for tag in symbols.values():
+        signature_parts(tag)
         
     print(f"   - Found {len(symbols)} unique symbols.", file=sys.stderr)
     return symbols
@@ -110,13 +138,31 @@ def reconstruct_signature(tag):
     else:
         return f"{kind} {name}"
 
+def signature_parts(tag):
+    """
+    Returns the (kind, ret, args, sig) tuple used for comparison.
+
+    The tuple is computed once and cached on the tag itself, so repeated
+    comparisons never re-derive the return type or the signature string.
+    """
+    parts = tag.get("_parts")
+    if parts is None:
+        parts = (
+            tag.get("kind"),
+            tag.get("typeref", "").replace("typename:", ""),
+            tag.get("signature", ""),
+            reconstruct_signature(tag),
+        )
+        tag["_parts"] = parts
+    return parts
+
 def compare_tags(tag_a, tag_b, version_a_name, version_b_name):
     """
     Compares two tag objects for the same symbol and returns a diff dict.
     Returns None if no meaningful difference is found.
     """
-    sig_a = reconstruct_signature(tag_a)
-    sig_b = reconstruct_signature(tag_b)
+    kind_a, ret_a, args_a, sig_a = signature_parts(tag_a)
+    kind_b, ret_b, args_b, sig_b = signature_parts(tag_b)
 
     # If full signatures are identical, no change to report
     if sig_a == sig_b:
@@ -128,13 +174,6 @@ def compare_tags(tag_a, tag_b, version_a_name, version_b_name):
     }
 
     # Determine the type of change (this is a syntactic analysis)
-    ret_a = tag_a.get("typeref", "").replace("typename:", "")
-    ret_b = tag_b.get("typeref", "").replace("typename:", "")
-    args_a = tag_a.get("signature", "")
-    args_b = tag_b.get("signature", "")
-    kind_a = tag_a.get("kind")
-    kind_b = tag_b.get("kind")
-
     if kind_a != kind_b:
         change_entry["change_type"] = "kind_modified"
         change_entry["old_kind"] = kind_a
@@ -166,6 +205,87 @@ def compare_tags(tag_a, tag_b, version_a_name, version_b_name):
 
     return final_output
 
+def removed_entry(tag_a, version_b_name):
+    """Builds the report entry for a symbol that only exists in version A."""
+    return {
+        "sigce": version_b_name,
+        "change_type": "removed",
+        "old_signature": signature_parts(tag_a)[3],
+        "new_signature": "N/A (Symbol removed)",
+        "semantic_change": "Symbol removal."
+    }
+
+def added_entry(tag_b, version_b_name):
+    """Builds the report entry for a symbol that only exists in version B."""
+    return {
+        "sigce": version_b_name,
+        "change_type": "added",
+        "old_signature": "N/A (Symbol did not exist)",
+        "new_signature": signature_parts(tag_b)[3],
+        "semantic_change": "Added new symbol functionality."
+    }
+
+def iter_changes(symbols_a, symbols_b, removed_names, added_names, modified_names,
+                 version_a_name, version_b_name, sort=True):
+    """
+    Yields (json_key, change_detail) for every changed symbol.
+
+    Each partition is handled by its own loop with no per-symbol branching.
+    With sort=True the three streams are merged by symbol name; otherwise
+    removed and modified symbols follow version A order and added symbols
+    follow version B order.
+    """
+    if sort:
+        removed_names = sorted(removed_names)
+        modified_names = sorted(modified_names)
+        added_names = sorted(added_names)
+    else:
+        removed_names = [name for name in symbols_a if name in removed_names]
+        modified_names = [name for name in symbols_a if name in modified_names]
+        added_names = [name for name in symbols_b if name in added_names]
+
+    streams = (
+        ((name, removed_entry(symbols_a[name], version_b_name)) for name in removed_names),
+        ((name, compare_tags(symbols_a[name], symbols_b[name], version_a_name, version_b_name))
+         for name in modified_names),
+        ((name, added_entry(symbols_b[name], version_b_name)) for name in added_names),
+    )
+    merged = heapq.merge(*streams, key=itemgetter(0)) if sort else chain(*streams)
+
+    for name, change_detail in merged:
+        if change_detail:
+            # Normalize the name for the final JSON key (e.g., dma_map_single -> dma-map-single)
+            yield name.replace("_", "-"), change_detail
+
+def write_changes(changes, output):
+    """
+    Streams (json_key, change_detail) pairs to output as one JSON object.
+
+    Each entry is serialized and written as soon as it is produced, so the
+    full diff is never held in memory. The entries go to a temporary file
+    next to output, which replaces output only once every change has been
+    written; a failed comparison leaves any previous report untouched.
+    Returns the number of entries written.
+    """
+    tmp_output = f"{os.fspath(output)}.tmp"
+    count = 0
+    try:
+        with open(tmp_output, 'wb', buffering=1 << 20) as f:
+            f.write(b'{')
+            for json_key, change_detail in changes:
+                f.write(b',\n  ' if count else b'\n  ')
+                f.write(_json_dumps(json_key) + b': ' + _json_dumps(change_detail).replace(b'\n', b'\n  '))
+                count += 1
+            f.write(b'\n}\n' if count else b'}\n')
+        os.replace(tmp_output, output)
+    except BaseException:
+        try:
+            os.remove(tmp_output)
+        except OSError:
+            pass
+        raise
+    return count
+
 def main():
     parser = argparse.ArgumentParser(description="Compare two ctags JSON files for API changes.")
     parser.add_argument("file_a", type=Path, help="Path to the first ctags JSON file (e.g., v5.15)")
@@ -174,6 +294,9 @@ def main():
     parser.add_argument("version_b", type=str, help="Version name for the second file (e.g., 'v6.1')")
     parser.add_argument("-o", "--output", type=Path, default="kernel_api_changes.json",
                         help="Output JSON file name (default: kernel_api_changes.json)")
+    parser.add_argument("--no-sort", action="store_true",
+                        help="Emit changes in ctags file order instead of sorting by symbol name "
+                             "(avoids sorting very large diffs)")
     
     args = parser.parse_args()
 
@@ -181,59 +304,33 @@ def main():
     symbols_a = parse_ctags_json(args.file_a)
     symbols_b = parse_ctags_json(args.file_b)
 
-    # Step 2: Find all unique symbol names across both versions
-    all_symbol_names = set(symbols_a.keys()) | set(symbols_b.keys())
+    # Step 2: Partition symbol names directly on the dict key views
+    removed_names = symbols_a.keys() - symbols_b.keys()
+    added_names = symbols_b.keys() - symbols_a.keys()
+    common_names = symbols_a.keys() & symbols_b.keys()
 
-    print(f"\n[+] Comparing {len(all_symbol_names)} total unique symbols...", file=sys.stderr)
-    
-    changes = {}
-
-    # Step 3: Iterate and compare
-    for name in sorted(all_symbol_names):
-        tag_a = symbols_a.get(name)
-        tag_b = symbols_b.get(name)
-
-        # Normalize the name for the final JSON key (e.g., dma_map_single -> dma-map-single)
-        json_key = name.replace("_", "-")
-        
-        change_detail = None
-
-        if tag_a and not tag_b:
-            # Symbol was removed
-            change_detail = {
-                "sigce": args.version_b,
-                "change_type": "removed",
-                "old_signature": reconstruct_signature(tag_a),
-                "new_signature": "N/A (Symbol removed)",
-                "semantic_change": "Symbol removal."
-            }
-        elif not tag_a and tag_b:
-            # Symbol was added
-            change_detail = {
-                "sigce": args.version_b,
-                "change_type": "added",
-                "old_signature": "N/A (Symbol did not exist)",
-                "new_signature": reconstruct_signature(tag_b),
-                "semantic_change": "Added new symbol functionality."
-            }
-        elif tag_a and tag_b:
-            # Symbol exists in both, check for modification
-            change_detail = compare_tags(tag_a, tag_b, args.version_a, args.version_b)
+    total = len(removed_names) + len(added_names) + len(common_names)
+    print(f"\n[+] Comparing {total} total unique symbols...", file=sys.stderr)
 
-        if change_detail:
-            changes[json_key] = change_detail
+    # Only symbols whose cached signatures differ can be modified
+    modified_names = {name for name in common_names
+                      if signature_parts(symbols_a[name])[3] != signature_parts(symbols_b[name])[3]}
 
-    # Step 4: Write the final JSON report
+    # Step 3 & 4: Compare and stream each change straight to the report
+    changes = iter_changes(symbols_a, symbols_b, removed_names, added_names, modified_names,
+                           args.version_a, args.version_b, sort=not args.no_sort)
     try:
-        with open(args.output, 'w') as f:
-            json.dump(changes, f, indent=4)
+        count = write_changes(changes, args.output)
         
         print(f"\n[OK] Comparison complete. Report saved to: {args.output}", file=sys.stderr)
-        print(f"   - Found {len(changes)} symbols with changes.", file=sys.stderr)
+        print(f"   - Found {count} symbols with changes.", file=sys.stderr)
 
-    except Exception as e:
+    except OSError as e:
         print(f"[!] Error writing output file: {e}", file=sys.stderr)
         sys.exit(1)
+    except Exception as e:
+        print(f"[!] Error comparing ctags files: {e}", file=sys.stderr)
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
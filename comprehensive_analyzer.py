@@ -4,7 +4,7 @@
 import json
 import sys
 from pathlib import Path
-from kernel_api_analyzer import KernelAPIAnalyzer
+from kernel_api_analyzer import KernelAPIAnalyzer, json_default
 from subsystem_analyzer import SubsystemAnalyzer
 from inline_function_analyzer import InlineFunctionAnalyzer
 from abi_impact_analyzer import ABIImpactAnalyzer
@@ -22,11 +22,14 @@ def run_comprehensive_analysis(old_kernel, new_kernel, output_file='kernel_api_c
     api_analyzer = KernelAPIAnalyzer(old_kernel, new_kernel)
     changes = api_analyzer.analyze()
     
-    # 步骤2: 子系统分析
-    print("\n[2/5] 执行子系统语义分析...")
+    # 步骤2: 子系统分析与ABI影响分析共享一次遍历
+    print("\n[2/5] 执行子系统语义分析与ABI影响分析...")
     subsys_analyzer = SubsystemAnalyzer(old_kernel, new_kernel)
-    subsys_changes = subsys_analyzer.analyze_subsystem_changes(changes)
-    changes['subsystem_analysis'] = subsys_changes
+    abi_analyzer = ABIImpactAnalyzer(changes)
+    for category, change in api_analyzer.iter_changes():
+        subsys_analyzer.visit(category, change)
+        abi_analyzer.visit(category, change)
+    changes['subsystem_analysis'] = subsys_analyzer.finalize()
     
     # 步骤3: 内联函数分析
     print("\n[3/5] 执行内联函数语义分析...")
@@ -34,16 +37,14 @@ def run_comprehensive_analysis(old_kernel, new_kernel, output_file='kernel_api_c
     inline_changes = inline_analyzer.analyze_inline_changes()
     changes['inline_functions'] = inline_changes
     
-    # 步骤4: ABI影响分析
-    print("\n[4/5] 执行ABI影响分析...")
-    abi_analyzer = ABIImpactAnalyzer(changes)
-    abi_impact = abi_analyzer.analyze_abi_impact()
+    # 步骤4: ABI影响报告
+    print("\n[4/5] 生成ABI影响报告...")
     changes['abi_impact'] = abi_analyzer.generate_abi_report()
     
     # 步骤5: 保存结果
     print("\n[5/5] 保存分析结果...")
     with open(output_file, 'w') as f:
-        json.dump(changes, f, indent=2, ensure_ascii=False)
+        json.dump(changes, f, indent=2, ensure_ascii=False, default=json_default)
     
     # 打印总结
     print("\n" + "="*60)
@@ -18,43 +18,113 @@ The input JSON is expected to have a structure like:
 import json
 import csv
 import html
+import io
 import argparse
 import sys
 import os
-from datetime import datetime
+import time
+from string import Template
+from pathlib import Path
+
+# orjson parses bytes directly and is much faster on large change reports;
+# fall back to the standard library when it is not installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# pyarrow's C++ CSV writer is much faster on large reports; the csv module
+# is used when it is not installed.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+def _esc(text):
+    """html.escape with a fast path for text that contains nothing to escape."""
+    if '&' in text or '<' in text or '>' in text or '"' in text or "'" in text:
+        return html.escape(text)
+    return text
+
+# Row CSS class and display title for the known change types, computed once
+_KNOWN_CHANGE_TYPES = (
+    'added', 'removed', 'modified', 'return_type_modified', 'arguments_modified'
+)
+_ROW_CLASS = {t: f"change-{t}" for t in _KNOWN_CHANGE_TYPES}
+_TYPE_TITLE = {t: t.replace("_", " ").title() for t in _KNOWN_CHANGE_TYPES}
+
+# CSV 表头的期望顺序，数据中不存在的键将不会被添加
+CSV_FIELD_ORDER = (
+    'symbol', 'change_type', 'sigce', 'old_signature',
+    'new_signature', 'semantic_change', 'old_kind', 'new_kind'
+)
+
+def _csv_str(value):
+    """Stringifies a cell the way csv.writer does (None becomes empty)."""
+    return '' if value is None else str(value)
+
+
+def _arrow_write_options():
+    """Returns pyarrow WriteOptions matching the csv.writer dialect, or None.
+
+    The header row is written separately by csv.writer, so only the row
+    terminator has to be configured. pyarrow releases without the `eol`
+    option would end rows with LF, so they fall back to the csv module.
+    """
+    try:
+        return pa_csv.WriteOptions(include_header=False, delimiter=',',
+                                   quoting_style='needed', eol='\r\n')
+    except (TypeError, ValueError):
+        return None
+
+
+def _write_csv_arrow(data, headers, csv_filepath, write_options):
+    """Writes the CSV report column by column through pyarrow."""
+    columns = [pa.array(list(data), type=pa.string())]
+    for h in headers[1:]:
+        columns.append(pa.array([_csv_str(d.get(h, '')) for d in data.values()], type=pa.string()))
+    table = pa.Table.from_arrays(columns, names=headers)
+
+    # Header through csv.writer: unquoted and CRLF-terminated, as in the fallback
+    header = io.StringIO()
+    csv.writer(header).writerow(headers)
+    with open(csv_filepath, 'wb') as f:
+        f.write(header.getvalue().encode('utf-8'))
+        pa_csv.write_csv(table, f, write_options=write_options)
+
 
 def generate_csv_report(data, csv_filepath):
     """Converts the JSON data to a CSV file."""
     
     print(f"[+] Generating CSV report at: {csv_filepath}")
     
-    # 1. 动态确定所有可能的表头
-    # 我们总是希望 'symbol' 在第一位
-    headers = set(['symbol'])
+    # 1. 动态确定所有可能的表头（一次遍历收集所有键）
+    headers = {'symbol'}
     for details in data.values():
-        headers.update(details.keys())
+        headers.update(details)
         
-    # 定义一个期望的顺序，不存在的键将不会被添加
-    field_order = [
-        'symbol', 'change_type', 'sigce', 'old_signature', 
-        'new_signature', 'semantic_change', 'old_kind', 'new_kind'
-    ]
-    
-    # 过滤，只保留数据中实际存在的表头
-    final_headers = [h for h in field_order if h in headers]
+    # 过滤，只保留数据中实际存在的表头（'symbol' 总在第一位）
+    final_headers = [h for h in CSV_FIELD_ORDER if h in headers]
     # 添加数据中存在但不在期望列表中的其他表头
-    final_headers.extend(sorted(list(headers - set(final_headers))))
+    final_headers.extend(sorted(headers.difference(CSV_FIELD_ORDER)))
 
+    write_options = _arrow_write_options() if pa is not None else None
     try:
-        with open(csv_filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=final_headers)
-            writer.writeheader()
+        if write_options is not None:
+            _write_csv_arrow(data, final_headers, csv_filepath, write_options)
+        else:
+            with open(csv_filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(final_headers)
             
-            for symbol, details in data.items():
-                # 创建一个新字典，包含符号名称
-                row_data = details.copy()
-                row_data['symbol'] = symbol
-                writer.writerow(row_data)
+                # 'symbol' 总是第一列，其余列直接按表头顺序取值，缺失的键写为空
+                columns = final_headers[1:]
+                writer.writerows(
+                    [symbol] + [details.get(h, '') for h in columns]
+                    for symbol, details in data.items()
+                )
                 
     except IOError as e:
         print(f"[!] Error writing CSV file: {e}", file=sys.stderr)
@@ -64,13 +134,9 @@ def generate_csv_report(data, csv_filepath):
     return True
 
 
-def generate_html_report(data, html_filepath, versions_info):
-    """Converts the JSON data to a standalone HTML report file with improved column widths."""
-    
-    print(f"[+] Generating HTML report at: {html_filepath}")
-
-    # 1. Define HTML and CSS template
-    html_template = """
+# HTML report template, parsed once at import. The rows are streamed between
+# the prefix and suffix, so the CSS needs no doubled braces.
+_HTML_PREFIX = Template("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -78,7 +144,7 @@ def generate_html_report(data, html_filepath, versions_info):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Kernel API Change Report</title>
     <style>
-        body {{ 
+        body { 
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, 
                          Helvetica, Arial, sans-serif; 
             line-height: 1.6; 
@@ -86,78 +152,78 @@ def generate_html_report(data, html_filepath, versions_info):
             color: #333;
             margin: 0;
             padding: 20px;
-        }}
-        h1, h2 {{ 
+        }
+        h1, h2 { 
             color: #111;
             border-bottom: 2px solid #eee;
             padding-bottom: 10px;
-        }}
-        table {{ 
+        }
+        table { 
             width: 100%; 
             border-collapse: collapse; 
             margin-top: 20px;
             box-shadow: 0 2px 5px rgba(0,0,0,0.1);
             background-color: #fff;
             table-layout: fixed; /* Crucial for controlling width */
-        }}
-        th, td {{ 
+        }
+        th, td { 
             border: 1px solid #ddd; 
             padding: 12px 15px; 
             text-align: left;
             vertical-align: top;
             word-break: break-word;
-        }}
-        th {{ 
+        }
+        th { 
             background-color: #f2f2f2; 
             color: #333;
             font-weight: 600;
-        }}
+        }
         
         /* --- Column Width Adjustments --- */
         /* Col 1: Symbol Name */
-        table th:nth-child(1), table td:nth-child(1) {{ width: 15%; }}
+        table th:nth-child(1), table td:nth-child(1) { width: 15%; }
         /* Col 2: Change Type (Narrower, as requested) */
-        table th:nth-child(2), table td:nth-child(2) {{ width: 10%; }}
+        table th:nth-child(2), table td:nth-child(2) { width: 10%; }
         /* Col 3: Old Signature */
-        table th:nth-child(3), table td:nth-child(3) {{ width: 25%; }}
+        table th:nth-child(3), table td:nth-child(3) { width: 25%; }
         /* Col 4: New Signature */
-        table th:nth-child(4), table td:nth-child(4) {{ width: 25%; }}
+        table th:nth-child(4), table td:nth-child(4) { width: 25%; }
         /* Col 5: Semantic Impact (Wider, as requested) */
-        table th:nth-child(5), table td:nth-child(5) {{ width: 25%; }}
+        table th:nth-child(5), table td:nth-child(5) { width: 25%; }
         /* -------------------------------- */
         
-        tr:nth-child(even) {{ background-color: #fcfcfc; }}
-        tr:hover {{ background-color: #f1f1f1; }}
-        code {{ 
+        tr:nth-child(even) { background-color: #fcfcfc; }
+        tr:hover { background-color: #f1f1f1; }
+        code { 
             font-family: "SFMono-Regular", Consolas, "Liberation Mono", Menlo, Courier, monospace;
             background-color: #eee;
             padding: 2px 4px;
             border-radius: 3px;
             font-size: 0.9em;
             white-space: pre-wrap; /* Allows code to wrap */
-        }}
-        .symbol-name {{ font-weight: 700; }}
+        }
+        .symbol-name { font-weight: 700; }
         
         /* Based on change type styles */
-        .change-added {{ background-color: #e6ffed; }}
-        .change-removed {{ background-color: #ffeef0; }}
-        .change-modified {{ background-color: #fff8e1; }}
-        .change-return_type_modified {{ background-color: #fff0e1; }}
-        .change-arguments_modified {{ background-color: #f0f8ff; }}
+        .change-added { background-color: #e6ffed; }
+        .change-removed { background-color: #ffeef0; }
+        .change-modified { background-color: #fff8e1; }
+        .change-return_type_modified { background-color: #fff0e1; }
+        .change-arguments_modified { background-color: #f0f8ff; }
         
-        .change-added .change-type {{ color: #228B22; font-weight: 700; }}
-        .change-removed .change-type {{ color: #D9534F; font-weight: 700; }}
-        .change-modified .change-type {{ color: #F0AD4E; font-weight: 700; }}
-        .change-return_type_modified .change-type {{ color: #E67E22; font-weight: 700; }}
-        .change-arguments_modified .change-type {{ color: #3498DB; font-weight: 700; }}
+        .change-added .change-type { color: #228B22; font-weight: 700; }
+        .change-removed .change-type { color: #D9534F; font-weight: 700; }
+        .change-modified .change-type { color: #F0AD4E; font-weight: 700; }
+        .change-return_type_modified .change-type { color: #E67E22; font-weight: 700; }
+        .change-arguments_modified .change-type { color: #3498DB; font-weight: 700; }
 
-        .todo {{ color: #D9534F; font-weight: 700; }}
+        .todo { color: #D9534F; font-weight: 700; }
     </style>
 </head>
 <body>
     <h1>Kernel API Change Report</h1>
-    <h2>Comparison between {version_a} and {version_b}</h2>
-    <p>Generated on: {generation_date}</p>
+    <h2>Comparison between $version_a and $version_b</h2>
+    <p>Generated on: $generation_date</p>
     
     <table>
         <thead>
@@ -170,186 +236,59 @@ def generate_html_report(data, html_filepath, versions_info):
             </tr>
         </thead>
         <tbody>
-            {table_rows}
+            """)
+
+_HTML_SUFFIX = """
         </tbody>
     </table>
 </body>
 </html>
     """
 
-    # 2. Generate table rows (same logic as before)
-    table_rows = []
-    
-    for symbol, details in sorted(data.items(), key=lambda item: item[0]):
-        change_type = html.escape(details.get('change_type', 'unknown'))
-        semantic = html.escape(details.get("semantic_change", ""))
-        if "TODO" in semantic:
-            semantic = f'<span class="todo">{semantic}</span>'
-
-        row_class = f"change-{change_type}"
-
-        table_rows.append(f'            <tr class="{row_class}">')
-        table_rows.append(f'                <td class="symbol-name">{html.escape(symbol)}</td>')
-        table_rows.append(f'                <td class="change-type">{change_type.replace("_", " ").title()}</td>')
-        table_rows.append(f'                <td><code>{html.escape(details.get("old_signature", "N/A"))}</code></td>')
-        table_rows.append(f'                <td><code>{html.escape(details.get("new_signature", "N/A"))}</code></td>')
-        table_rows.append(f'                <td>{semantic}</td>')
-        table_rows.append('            </tr>')
-
-    # 3. Fill template (same logic as before)
-    final_html = html_template.format(
-        version_a=html.escape(versions_info.get("version_a", "vA")),
-        version_b=html.escape(versions_info.get("version_b", "vB")),
-        generation_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        table_rows="\n".join(table_rows)
-    )
 
-    # 4. Write to file (same logic as before)
-    try:
-        with open(html_filepath, 'w', encoding='utf-8') as f:
-            f.write(final_html)
-    except IOError as e:
-        print(f"[!] Error writing HTML file: {e}", file=sys.stderr)
-        return False
-
-    print(f"    ... HTML report generated successfully.")
-    return True
+def _render_row(symbol, details):
+    """Renders one table row (without the leading separator)."""
+    change_type = _esc(details.get('change_type', 'unknown'))
+    semantic = _esc(details.get("semantic_change", ""))
+    if "TODO" in semantic:
+        semantic = f'<span class="todo">{semantic}</span>'
+
+    row_class = _ROW_CLASS.get(change_type) or f"change-{change_type}"
+    title = _TYPE_TITLE.get(change_type) or change_type.replace("_", " ").title()
+
+    return (
+        f'            <tr class="{row_class}">\n'
+        f'                <td class="symbol-name">{_esc(symbol)}</td>\n'
+        f'                <td class="change-type">{title}</td>\n'
+        f'                <td><code>{_esc(details.get("old_signature", "N/A"))}</code></td>\n'
+        f'                <td><code>{_esc(details.get("new_signature", "N/A"))}</code></td>\n'
+        f'                <td>{semantic}</td>\n'
+        '            </tr>'
+    )
 
 
-def generate_html_report_bak(data, html_filepath, versions_info):
-    """Converts the JSON data to a standalone HTML report file."""
+def generate_html_report(data, html_filepath, versions_info):
+    """Converts the JSON data to a standalone HTML report file with improved column widths."""
     
     print(f"[+] Generating HTML report at: {html_filepath}")
 
-    # 1. 定义HTML和CSS模板
-    # CSS为不同类型的变更提供了视觉提示
-    html_template = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Kernel API Change Report</title>
-    <style>
-        body {{ 
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, 
-                         Helvetica, Arial, sans-serif; 
-            line-height: 1.6; 
-            background-color: #f9f9f9;
-            color: #333;
-            margin: 0;
-            padding: 20px;
-        }}
-        h1, h2 {{ 
-            color: #111;
-            border-bottom: 2px solid #eee;
-            padding-bottom: 10px;
-        }}
-        table {{ 
-            width: 100%; 
-            border-collapse: collapse; 
-            margin-top: 20px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-            background-color: #fff;
-        }}
-        th, td {{ 
-            border: 1px solid #ddd; 
-            padding: 12px 15px; 
-            text-align: left;
-            vertical-align: top;
-            word-break: break-word;
-        }}
-        th {{ 
-            background-color: #f2f2f2; 
-            color: #333;
-            font-weight: 600;
-        }}
-        tr:nth-child(even) {{ background-color: #fcfcfc; }}
-        tr:hover {{ background-color: #f1f1f1; }}
-        code {{ 
-            font-family: "SFMono-Regular", Consolas, "Liberation Mono", Menlo, Courier, monospace;
-            background-color: #eee;
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-size: 0.9em;
-            white-space: pre-wrap; /* 允许代码换行 */
-        }}
-        .symbol-name {{ font-weight: 700; }}
-        
-        /* 基于变更类型的样式 */
-        .change-added {{ background-color: #e6ffed; }}
-        .change-removed {{ background-color: #ffeef0; }}
-        .change-modified {{ background-color: #fff8e1; }}
-        .change-return_type_modified {{ background-color: #fff0e1; }}
-        .change-arguments_modified {{ background-color: #f0f8ff; }}
-        
-        .change-added .change-type {{ color: #228B22; font-weight: 700; }}
-        .change-removed .change-type {{ color: #D9534F; font-weight: 700; }}
-        .change-modified .change-type {{ color: #F0AD4E; font-weight: 700; }}
-        .change-return_type_modified .change-type {{ color: #E67E22; font-weight: 700; }}
-        .change-arguments_modified .change-type {{ color: #3498DB; font-weight: 700; }}
-
-        .todo {{ color: #D9534F; font-weight: 700; }}
-    </style>
-</head>
-<body>
-    <h1>Kernel API Change Report</h1>
-    <h2>Comparison between {version_a} and {version_b}</h2>
-    <p>Generated on: {generation_date}</p>
-    
-    <table>
-        <thead>
-            <tr>
-                <th>Symbol</th>
-                <th>Change Type</th>
-                <th>Old Signature / Value</th>
-                <th>New Signature / Value</th>
-                <th>Semantic Impact (Manual Analysis)</th>
-            </tr>
-        </thead>
-        <tbody>
-            {table_rows}
-        </tbody>
-    </table>
-</body>
-</html>
-    """
-
-    # 2. 生成表格行
-    table_rows = []
-    
-    # 按符号名称排序
-    for symbol, details in sorted(data.items(), key=lambda item: item[0]):
-        change_type = html.escape(details.get('change_type', 'unknown'))
-        
-        # 为包含 "TODO" 的语义添加特殊样式
-        semantic = html.escape(details.get("semantic_change", ""))
-        if "TODO" in semantic:
-            semantic = f'<span class="todo">{semantic}</span>'
-
-        # 为不同变更类型添加CSS类
-        row_class = f"change-{change_type}"
-
-        table_rows.append(f'            <tr class="{row_class}">')
-        table_rows.append(f'                <td class="symbol-name">{html.escape(symbol)}</td>')
-        table_rows.append(f'                <td class="change-type">{change_type.replace("_", " ").title()}</td>')
-        table_rows.append(f'                <td><code>{html.escape(details.get("old_signature", "N/A"))}</code></td>')
-        table_rows.append(f'                <td><code>{html.escape(details.get("new_signature", "N/A"))}</code></td>')
-        table_rows.append(f'                <td>{semantic}</td>')
-        table_rows.append('            </tr>')
-
-    # 3. 填充模板
-    final_html = html_template.format(
+    # 1. Fill the header fields of the pre-parsed template once
+    prefix = _HTML_PREFIX.substitute(
         version_a=html.escape(versions_info.get("version_a", "vA")),
         version_b=html.escape(versions_info.get("version_b", "vB")),
-        generation_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        table_rows="\n".join(table_rows)
+        generation_date=time.strftime("%Y-%m-%d %H:%M:%S")
     )
 
-    # 4. 写入文件
+    # 2. Stream the rows straight to the file instead of building the whole document
     try:
-        with open(html_filepath, 'w', encoding='utf-8') as f:
-            f.write(final_html)
+        with open(html_filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(prefix)
+            separator = ''
+            for symbol, details in sorted(data.items()):
+                f.write(separator)
+                f.write(_render_row(symbol, details))
+                separator = '\n'
+            f.write(_HTML_SUFFIX)
     except IOError as e:
         print(f"[!] Error writing HTML file: {e}", file=sys.stderr)
         return False
@@ -357,6 +296,7 @@ def generate_html_report_bak(data, html_filepath, versions_info):
     print(f"    ... HTML report generated successfully.")
     return True
 
+
 def main():
     parser = argparse.ArgumentParser(description="Convert Kernel API Changes JSON to CSV and HTML reports.")
     parser.add_argument("input_json", 
@@ -379,9 +319,8 @@ def main():
 
     # 2. 加载JSON数据
     try:
-        with open(args.input_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+        data = _json_loads(Path(args.input_json).read_bytes())
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError 是它的子类
         print(f"[!] Error: Failed to parse JSON file: {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
@@ -27,6 +27,12 @@ generate_tags() {
         --exclude=*.a \
         .
     
+    # 可选：压缩 JSON tags（CTAGS_COMPRESS=zst 或 gz），分析脚本会自动识别压缩文件
+    case "$CTAGS_COMPRESS" in
+        zst) zstd -3 -q -f --rm tags.json ;;
+        gz)  gzip -f tags.json ;;
+    esac
+    
     # 同时生成传统格式以便查询
     ctags \
         --languages=C \
@@ -40,7 +46,7 @@ generate_tags() {
         --exclude=scripts \
         .
     
-    echo "Tags 生成完成: $kernel_dir/tags.json"
+    echo "Tags 生成完成: $kernel_dir/tags.json${CTAGS_COMPRESS:+.$CTAGS_COMPRESS}"
 }
 
 generate_tags "$WORK_DIR/linux-old" "old"
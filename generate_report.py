@@ -3,13 +3,28 @@
 
 import json
 import sys
-from datetime import datetime
+import time
+from pathlib import Path
+
+# 优先使用 orjson 直接解析字节，未安装时退回标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 def generate_html_report(changes_file):
-    with open(changes_file, 'r') as f:
-        data = json.load(f)
+    data = _json_loads(Path(changes_file).read_bytes())
+    
+    output_file = 'kernel_api_report.html'
+    # 边生成边写入带缓冲的文件，避免反复拼接整份 HTML 字符串
+    with open(output_file, 'w', buffering=1 << 20) as f:
+        write_report(data, f)
     
-    html = f"""
+    print(f"HTML报告已生成: {output_file}")
+
+def write_report(data, f):
+    f.write(f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -40,56 +55,50 @@ def generate_html_report(changes_file):
 </head>
 <body>
     <h1>Linux Kernel API Changes Report</h1>
-    <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    <p>Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
     
     <div class="summary">
         <h2>Summary</h2>
-"""
+""")
     
     # 添加统计摘要
     for category, stats in data.get('summary', {}).items():
-        html += f"""
+        f.write(f"""
         <div class="stat">
             <strong>{category.upper()}</strong><br>
             <span class="added">+{stats['added']}</span> | 
             <span class="removed">-{stats['removed']}</span> | 
             <span class="modified">~{stats['modified']}</span>
         </div>
-"""
+""")
     
-    html += """
+    f.write("""
     </div>
-"""
+""")
     
     # 函数变化
-    html += generate_function_section(data.get('functions', []))
+    f.write(generate_function_section(data.get('functions', [])))
     
     # 结构体变化
-    html += generate_struct_section(data.get('structs', []))
+    f.write(generate_struct_section(data.get('structs', [])))
     
     # 宏变化
-    html += generate_macro_section(data.get('macros', []))
+    f.write(generate_macro_section(data.get('macros', [])))
     
     # 子系统分析
     if 'subsystem_analysis' in data:
-        html += generate_subsystem_section(data['subsystem_analysis'])
+        f.write(generate_subsystem_section(data['subsystem_analysis']))
     
-    html += """
+    f.write("""
 </body>
 </html>
-"""
-    
-    output_file = 'kernel_api_report.html'
-    with open(output_file, 'w') as f:
-        f.write(html)
-    
-    print(f"HTML报告已生成: {output_file}")
+""")
 
-def generate_function_section(functions):
-    if not functions:
-        return ""
-    
-    html = """
+# 变更类型对应的样式类，避免每行拼接
+_CHANGE_CLASS = {t: f"change-{t}" for t in ('added', 'removed', 'modified')}
+
+# 各节表头固定不变，只构造一次
+_FUNCTION_TABLE_HEAD = """
     <h2>Function Changes</h2>
     <table>
         <tr>
@@ -99,44 +108,74 @@ def generate_function_section(functions):
             <th>Details</th>
         </tr>
 """
+
+_STRUCT_TABLE_HEAD = """
+    <h2>Structure Changes</h2>
+    <table>
+        <tr>
+            <th>Structure Name</th>
+            <th>Change Type</th>
+            <th>File</th>
+            <th>Field Changes</th>
+        </tr>
+"""
+
+_MACRO_TABLE_HEAD = """
+    <h2>Macro Changes</h2>
+    <table>
+        <tr>
+            <th>Macro Name</th>
+            <th>Change Type</th>
+            <th>File</th>
+            <th>Definition</th>
+        </tr>
+"""
+
+_TABLE_TAIL = """
+    </table>
+"""
+
+def generate_function_section(functions):
+    if not functions:
+        return ""
+    
+    parts = [_FUNCTION_TABLE_HEAD]
     
     for func in functions:
         change_type = func['change_type']
-        change_class = f"change-{change_type}"
+        change_class = _CHANGE_CLASS.get(change_type) or f"change-{change_type}"
         
-        details = ""
+        details = []
         if change_type == 'modified':
-            details = f"""
+            details.append(f"""
                 <div class="code">
                     <strong>Old:</strong> {func.get('old_signature', 'N/A')}<br>
                     <strong>New:</strong> {func.get('new_signature', 'N/A')}
                 </div>
-"""
+""")
             if func.get('parameter_changes'):
-                details += "<strong>Parameter Changes:</strong><br>"
+                details.append("<strong>Parameter Changes:</strong><br>")
                 for pchange in func['parameter_changes']:
-                    details += f"<div class='param-change'>{format_param_change(pchange)}</div>"
+                    details.append(f"<div class='param-change'>{format_param_change(pchange)}</div>")
             
             if func.get('return_type_changed'):
-                details += f"""
+                details.append(f"""
                 <div class='param-change'>
                     <strong>Return Type:</strong> {func.get('old_return_type')} → {func.get('new_return_type')}
                 </div>
-"""
+""")
         
-        html += f"""
+        parts.append(f"""
         <tr>
             <td><code>{func['name']}</code></td>
             <td><span class="change-type {change_class}">{change_type}</span></td>
             <td>{func.get('file', 'N/A')}</td>
-            <td>{details}</td>
+            <td>{''.join(details)}</td>
         </tr>
-"""
+""")
     
-    html += """
-    </table>
-"""
-    return html
+    parts.append(_TABLE_TAIL)
+    return ''.join(parts)
 
 def format_param_change(pchange):
     ptype = pchange.get('type', '')
@@ -158,72 +197,52 @@ def generate_struct_section(structs):
     if not structs:
         return ""
     
-    html = """
-    <h2>Structure Changes</h2>
-    <table>
-        <tr>
-            <th>Structure Name</th>
-            <th>Change Type</th>
-            <th>File</th>
-            <th>Field Changes</th>
-        </tr>
-"""
+    parts = [_STRUCT_TABLE_HEAD]
     
     for struct in structs:
         change_type = struct['change_type']
-        change_class = f"change-{change_type}"
+        change_class = _CHANGE_CLASS.get(change_type) or f"change-{change_type}"
         
-        details = ""
+        details = []
         if change_type == 'modified' and 'field_changes' in struct:
             fc = struct['field_changes']
             
             if fc.get('added'):
-                details += "<strong>Added fields:</strong><br>"
+                details.append("<strong>Added fields:</strong><br>")
                 for field in fc['added']:
-                    details += f"<div class='param-change'>+ {field}</div>"
+                    details.append(f"<div class='param-change'>+ {field}</div>")
             
             if fc.get('removed'):
-                details += "<strong>Removed fields:</strong><br>"
+                details.append("<strong>Removed fields:</strong><br>")
                 for field in fc['removed']:
-                    details += f"<div class='param-change'>- {field}</div>"
+                    details.append(f"<div class='param-change'>- {field}</div>")
             
             if fc.get('modified'):
-                details += "<strong>Modified fields:</strong><br>"
+                details.append("<strong>Modified fields:</strong><br>")
                 for mod in fc['modified']:
-                    details += f"<div class='param-change'>~ Position {mod['position']}: {mod['change']}</div>"
+                    details.append(f"<div class='param-change'>~ Position {mod['position']}: {mod['change']}</div>")
         
-        html += f"""
+        parts.append(f"""
         <tr>
             <td><code>struct {struct['name']}</code></td>
             <td><span class="change-type {change_class}">{change_type}</span></td>
             <td>{struct.get('file', 'N/A')}</td>
-            <td>{details}</td>
+            <td>{''.join(details)}</td>
         </tr>
-"""
+""")
     
-    html += """
-    </table>
-"""
-    return html
+    parts.append(_TABLE_TAIL)
+    return ''.join(parts)
 
 def generate_macro_section(macros):
     if not macros:
         return ""
     
-    html = """
-    <h2>Macro Changes</h2>
-    <table>
-        <tr>
-            <th>Macro Name</th>
-            <th>Change Type</th>
-            <th>File</th>
-            <th>Definition</th>
-        </tr>
-"""
+    parts = [_MACRO_TABLE_HEAD]
     
     for macro in macros:
         change_type = macro['change_type']
-        change_class = f"change-{change_type}"
+        change_class = _CHANGE_CLASS.get(change_type) or f"change-{change_type}"
         
         details = ""
         if change_type == 'modified':
@@ -234,56 +253,54 @@ def generate_macro_section(macros):
                 </div>
 """
         
-        html += f"""
+        parts.append(f"""
         <tr>
             <td><code>{macro['name']}</code></td>
             <td><span class="change-type {change_class}">{change_type}</span></td>
             <td>{macro.get('file', 'N/A')}</td>
             <td>{details}</td>
         </tr>
-"""
+""")
     
-    html += """
-    </table>
-"""
-    return html
+    parts.append(_TABLE_TAIL)
+    return ''.join(parts)
 
 def generate_subsystem_section(subsystems):
-    html = """
+    parts = ["""
     <h2>Subsystem Analysis</h2>
-"""
+"""]
     
     for subsys_name, subsys_data in subsystems.items():
         func_count = len(subsys_data.get('functions', []))
         struct_count = len(subsys_data.get('structs', []))
         
-        html += f"""
+        parts.append(f"""
     <div class="subsystem">
         <h3>{subsys_name.upper()} Subsystem</h3>
         <p>
             <strong>Changes:</strong> 
             {func_count} functions, {struct_count} structures
         </p>
-"""
+""")
         
         # 语义变化模式
         patterns = subsys_data.get('semantic_changes', [])
         if patterns:
-            html += "<h4>Detected Patterns:</h4>"
+            parts.append("<h4>Detected Patterns:</h4>")
             for pattern in patterns:
-                html += f"""
+                parts.append(f"""
         <div class="semantic-pattern">
             <strong>{pattern['pattern'].replace('_', ' ').title()}</strong><br>
             {pattern['description']}<br>
             <em>Impact: {pattern['impact']}</em>
         </div>
-"""
+""")
         
-        html += """
+        parts.append("""
     </div>
-"""
+""")
     
-    return html
+    return ''.join(parts)
 
 if __name__ == '__main__':
     if len(sys.argv) != 2:
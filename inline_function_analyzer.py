@@ -1,81 +1,185 @@
 #!/usr/bin/env python3
 # inline_function_analyzer.py - 内联函数语义分析
 
+import hashlib
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# 内联函数定义的开头，到函数体的 '{' 为止（在映射的原始字节上匹配）
+_INLINE_PROLOGUE_RE = re.compile(
+    rb'(?:static\s+)?inline\s+\w+\s+(\w+)\s*\([^)]*\)\s*\{'
+)
+# 函数体内影响括号配对的记号：'{'、'}'，以及需要整体跳过的字符串、字符常量和注释
+_BODY_TOKEN_RE = re.compile(
+    rb'(\{)|(\})|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|/\*.*?\*/|//[^\n]*',
+    re.DOTALL
+)
+# 计算内容哈希前的规范化：字符串和字符常量原样保留（其中的 '//'、'/*' 和空白都有意义），
+# 其余位置连续的空白与注释合并为一个空格
+_CANON_TOKEN_RE = re.compile(
+    rb'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')|(?:\s+|/\*.*?\*/|//[^\n]*)+',
+    re.DOTALL
+)
+
+# 语义变化分析用到的模式
+_CALL_RE = re.compile(r'\b(\w+)\s*\(')
+_RETURN_RE = re.compile(r'return\s+([^;]+);')
+
+def _scan_body(definition):
+    """一次扫描得到 (调用集合, return 表达式列表, if 分支数)"""
+    # `if (` 本身就是 _CALL_RE 的一次匹配，if 计数直接从调用列表中统计，
+    # 省去单独的 `\bif\s*\(` 扫描
+    calls = _CALL_RE.findall(definition)
+    return set(calls), _RETURN_RE.findall(definition), calls.count('if')
+
+def _body_hash(body):
+    """去掉注释、合并空白后计算稳定的内容哈希（跨进程、跨运行一致）"""
+    canon = _CANON_TOKEN_RE.sub(lambda m: m.group(1) or b' ', body).strip()
+    return hashlib.blake2b(canon, digest_size=16).hexdigest()
+
+def _find_close(buf, start):
+    """从 start（函数体 '{' 之后）开始找到配对的 '}'，返回其偏移；不配对时返回 -1"""
+    depth = 1
+    for token in _BODY_TOKEN_RE.finditer(buf, start):
+        if token.lastindex == 1:
+            depth += 1
+        elif token.lastindex == 2:
+            depth -= 1
+            if depth == 0:
+                return token.start()
+    return -1
+
+def _iter_inline_functions(buf):
+    """逐个产出 (函数名, 完整定义) 字节串，函数体支持嵌套的花括号"""
+    pos = 0
+    while True:
+        match = _INLINE_PROLOGUE_RE.search(buf, pos)
+        if match is None:
+            return
+        close = _find_close(buf, match.end())
+        if close == -1:  # 函数体没有闭合，跳过这个开头继续找
+            pos = match.end()
+            continue
+        yield match.group(1), buf[match.start():close + 1]
+        pos = close + 1
+
+def _iter_headers(root):
+    """用 os.scandir 递归遍历目录，产出所有 .h 文件路径（字符串）"""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:  # 目录不存在或无权限
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.h') and entry.is_file():
+                    yield entry.path
+
+def _scan_header(header, kernel_path):
+    """扫描单个头文件，返回 [(函数名, 相对路径, 定义, 哈希), ...]（进程池工作函数）"""
+    try:
+        with open(header, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # 无法读取或空文件
+        return []
+        
+    with mm:
+        # 预过滤：不含 inline 关键字的头文件不可能匹配，跳过正则扫描
+        if mm.find(b'inline') == -1:
+            return []
+            
+        rel_file = os.path.relpath(header, kernel_path)
+        return [
+            (name.decode('ascii'), rel_file,
+             definition.decode('utf-8', errors='ignore'), _body_hash(definition))
+            for name, definition in _iter_inline_functions(mm)
+        ]
+
 class InlineFunctionAnalyzer:
     def __init__(self, old_kernel, new_kernel):
         self.old_kernel = Path(old_kernel)
         self.new_kernel = Path(new_kernel)
     
-    def find_inline_functions(self, kernel_path):
+    def find_inline_functions(self, kernel_path, max_workers=None):
         """查找所有内联函数"""
-        inline_funcs = {}
+        # 遍历所有头文件，各文件相互独立，可并行扫描
+        headers = list(_iter_headers(os.path.join(kernel_path, 'include')))
+        roots = [str(kernel_path)] * len(headers)
         
-        # 遍历所有头文件
-        for header in kernel_path.glob('include/**/*.h'):
-            try:
-                with open(header, 'r', errors='ignore') as f:
-                    content = f.read()
-                
-                # 匹配内联函数定义
-                pattern = r'(?:static\s+)?inline\s+\w+\s+(\w+)\s*\([^)]*\)\s*\{[^}]*\}'
-                matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
-                
-                for match in matches:
-                    func_name = match.group(1)
-                    func_body = match.group(0)
-                    
-                    inline_funcs[func_name] = {
-                        'file': str(header.relative_to(kernel_path)),
-                        'definition': func_body,
-                        'body_hash': hash(func_body)
-                    }
-            except Exception as e:
-                continue
-        
-        return inline_funcs
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(headers) < 2:
+            results = map(_scan_header, headers, roots)
+            return self._collect(results)
+            
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_scan_header, headers, roots, chunksize=64)
+            return self._collect(results)
+    
+    def _collect(self, results):
+        """合并各头文件的扫描结果，按列存放：{'hashes', 'defs', 'file_of'} 三个以函数名为键的字典"""
+        hashes, defs, file_of = {}, {}, {}
+        for matches in results:
+            for func_name, rel_file, func_body, body_hash in matches:
+                hashes[func_name] = body_hash
+                defs[func_name] = func_body
+                file_of[func_name] = rel_file
+        return {'hashes': hashes, 'defs': defs, 'file_of': file_of}
     
-    def analyze_inline_changes(self):
+    def analyze_inline_changes(self, max_workers=None):
         """分析内联函数的语义变化"""
         print("分析内联函数变化...")
         
-        old_inlines = self.find_inline_functions(self.old_kernel)
-        new_inlines = self.find_inline_functions(self.new_kernel)
+        old_inlines = self.find_inline_functions(self.old_kernel, max_workers)
+        new_inlines = self.find_inline_functions(self.new_kernel, max_workers)
         
-        changes = []
+        # 检查修改的内联函数：只比较哈希列，哈希相同的直接跳过，
+        # 只对真正变化的才取出定义做语义分析
+        old_hashes = old_inlines['hashes']
+        new_hashes = new_inlines['hashes']
+        changed = [
+            name for name in old_hashes.keys() & new_hashes.keys()
+            if old_hashes[name] != new_hashes[name]
+        ]
+        old_defs = [old_inlines['defs'][name] for name in changed]
+        new_defs = [new_inlines['defs'][name] for name in changed]
         
-        # 检查修改的内联函数
-        for name in set(old_inlines.keys()) & set(new_inlines.keys()):
-            old_func = old_inlines[name]
-            new_func = new_inlines[name]
-            
-            if old_func['body_hash'] != new_func['body_hash']:
-                semantic_change = self._analyze_semantic_change(
-                    old_func['definition'],
-                    new_func['definition']
-                )
-                
-                changes.append({
-                    'name': name,
-                    'file': new_func['file'],
-                    'change_type': 'semantic_change',
-                    'old_definition': old_func['definition'],
-                    'new_definition': new_func['definition'],
-                    'semantic_analysis': semantic_change
-                })
+        # re 匹配期间持有 GIL，线程池无法并行，改用进程池
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or len(changed) < 2:
+            analyses = list(map(self._analyze_semantic_change, old_defs, new_defs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                analyses = list(pool.map(self._analyze_semantic_change,
+                                         old_defs, new_defs, chunksize=64))
         
-        return changes
+        new_file_of = new_inlines['file_of']
+        return [
+            {
+                'name': name,
+                'file': new_file_of[name],
+                'change_type': 'semantic_change',
+                'old_definition': old_def,
+                'new_definition': new_def,
+                'semantic_analysis': semantic_change
+            }
+            for name, old_def, new_def, semantic_change
+            in zip(changed, old_defs, new_defs, analyses)
+        ]
     
     def _analyze_semantic_change(self, old_def, new_def):
         """分析语义变化类型"""
         changes = []
         
-        # 检查是否添加了新的函数调用
-        old_calls = set(re.findall(r'\b(\w+)\s*\(', old_def))
-        new_calls = set(re.findall(r'\b(\w+)\s*\(', new_def))
+        old_calls, old_returns, old_ifs = _scan_body(old_def)
+        new_calls, new_returns, new_ifs = _scan_body(new_def)
         
+        # 检查是否添加了新的函数调用
         added_calls = new_calls - old_calls
         removed_calls = old_calls - new_calls
         
@@ -92,9 +196,6 @@ class InlineFunctionAnalyzer:
             })
         
         # 检查返回值变化
-        old_returns = re.findall(r'return\s+([^;]+);', old_def)
-        new_returns = re.findall(r'return\s+([^;]+);', new_def)
-        
         if old_returns != new_returns:
             changes.append({
                 'type': 'return_value_logic_change',
@@ -102,9 +203,6 @@ class InlineFunctionAnalyzer:
             })
         
         # 检查条件逻辑变化
-        old_ifs = len(re.findall(r'\bif\s*\(', old_def))
-        new_ifs = len(re.findall(r'\bif\s*\(', new_def))
-        
         if old_ifs != new_ifs:
             changes.append({
                 'type': 'control_flow_change',
@@ -1,17 +1,86 @@
 #!/usr/bin/env python3
 # kernel_api_analyzer.py - 主分析脚本
 
+import filecmp
 import json
+import os
+import re
 import sys
-from pathlib import Path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from parse_ctags import parse_kernel_tags
-from analyze_source_diff import SourceDiffAnalyzer
+from analyze_source_diff import (
+    ChangeRecord, FunctionChange, MacroChange, SourceDiffAnalyzer, StructChange
+)
+
+def json_default(obj):
+    """json/orjson 的 default 钩子：把变更记录转换为普通字典"""
+    if isinstance(obj, ChangeRecord):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# 优先使用 orjson 序列化（直接生成字节），未安装时退回标准库
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(
+            obj, default=json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2, default=json_default).encode()
+
+# 函数名之前的返回类型（去掉 static/inline/extern 等存储类修饰）
+_RETURN_TYPE_RE = re.compile(
+    r'\s*(?:(?:static|extern|inline|__inline|__inline__|__always_inline)\s+)*(.*?)\s*\b\w+\s*\('
+)
+
+def _return_type(signature):
+    """从完整签名中取出返回类型，无法识别时返回空串"""
+    match = _RETURN_TYPE_RE.match(signature)
+    return match.group(1) if match else ''
+
+def _reintern_symbols(symbols):
+    """子进程的解析结果经 pickle 传回后不再是驻留字符串，在父进程中重新驻留名称与路径"""
+    intern = sys.intern
+    for category, bucket in symbols.items():
+        rebuilt = {}
+        for name, info in bucket.items():
+            if isinstance(name, str):
+                name = intern(name)
+                info['name'] = name
+            info['file'] = intern(info['file'])
+            info['scope'] = intern(info['scope'])
+            info['access'] = intern(info['access'])
+            rebuilt[name] = info
+        symbols[category] = rebuilt
+    return symbols
+
+def _partition_symbols(old, new):
+    """把新旧两版符号表划分为 (新增, 删除, 共有) 三组
+    
+    直接在 dict 的键视图上做集合运算，不复制出完整的 set；
+    共有部分遍历较小的一边、在较大的一边中探测
+    """
+    added = new.keys() - old.keys()
+    removed = old.keys() - new.keys()
+    if len(old) <= len(new):
+        common = [name for name in old if name in new]
+    else:
+        common = [name for name in new if name in old]
+    return added, removed, common
 
 class KernelAPIAnalyzer:
     def __init__(self, old_kernel, new_kernel):
         self.old_kernel = old_kernel
         self.new_kernel = new_kernel
         self.analyzer = SourceDiffAnalyzer(old_kernel, new_kernel)
+        # 源文件路径的根目录，热循环里用 os.path.join 拼接，避免逐个构造 Path
+        self._old_base = str(old_kernel)
+        self._new_base = str(new_kernel)
         self.changes = {
             'functions': [],
             'structs': [],
@@ -21,19 +90,16 @@ class KernelAPIAnalyzer:
             'summary': {}
         }
         
-    def analyze(self):
+    def analyze(self, max_workers=None):
         """执行完整分析"""
-        print("步骤 1: 解析旧版本 ctags...")
-        old_symbols = parse_kernel_tags(self.old_kernel)
-        
-        print("步骤 2: 解析新版本 ctags...")
-        new_symbols = parse_kernel_tags(self.new_kernel)
+        old_symbols, new_symbols = self._parse_both(max_workers)
+        function_sources, struct_sources = self._extract_sources(old_symbols, new_symbols, max_workers)
         
         print("步骤 3: 分析函数变化...")
-        self._analyze_functions(old_symbols['functions'], new_symbols['functions'])
+        self._analyze_functions(old_symbols['functions'], new_symbols['functions'], function_sources)
         
         print("步骤 4: 分析结构体变化...")
-        self._analyze_structs(old_symbols['structs'], new_symbols['structs'])
+        self._analyze_structs(old_symbols['structs'], new_symbols['structs'], struct_sources)
         
         print("步骤 5: 分析宏变化...")
         self._analyze_macros(old_symbols['macros'], new_symbols['macros'])
@@ -46,185 +112,266 @@ class KernelAPIAnalyzer:
         
         return self.changes
         
-    def _analyze_functions(self, old_funcs, new_funcs):
+    def _parse_both(self, max_workers=None):
+        """解析新旧两版 ctags；两者相互独立，多核时在两个进程中同时解析"""
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1:
+            print("步骤 1: 解析旧版本 ctags...")
+            old_symbols = parse_kernel_tags(self.old_kernel)
+            print("步骤 2: 解析新版本 ctags...")
+            new_symbols = parse_kernel_tags(self.new_kernel)
+            return old_symbols, new_symbols
+            
+        print("步骤 1: 解析旧版本 ctags...")
+        print("步骤 2: 解析新版本 ctags...")
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            old_future = pool.submit(parse_kernel_tags, self.old_kernel)
+            new_future = pool.submit(parse_kernel_tags, self.new_kernel)
+            return _reintern_symbols(old_future.result()), _reintern_symbols(new_future.result())
+            
+    def iter_changes(self):
+        """逐条产出 (category, change)，供多个分析器在一次遍历中共享
+        
+        函数先于结构体产出，与子系统分析单独遍历时的顺序一致（决定子系统的出现顺序）；
+        ABI 分析按类别分别记录，不受遍历顺序影响
+        """
+        for category in ('functions', 'structs', 'macros', 'typedefs', 'enums'):
+            for change in self.changes[category]:
+                yield category, change
+                
+    def _changed_candidates(self, old_syms, new_syms, common_names):
+        """筛出需要重新提取源码比较的共有符号
+        
+        同一行号且两版源文件内容完全相同的符号，提取结果必然一致，直接跳过；
+        仅比较 ctags 的 signature 不够（它不含返回类型），因此按文件内容判断
+        """
+        join = os.path.join
+        old_base, new_base = self._old_base, self._new_base
+        same_file = {}
+        candidates = []
+        for name in common_names:
+            old_sym = old_syms[name]
+            new_sym = new_syms[name]
+            if old_sym['line'] == new_sym['line']:
+                key = (old_sym['file'], new_sym['file'])
+                same = same_file.get(key)
+                if same is None:
+                    try:
+                        same = filecmp.cmp(join(old_base, key[0]), join(new_base, key[1]), shallow=False)
+                    except OSError:
+                        same = False
+                    same_file[key] = same
+                if same:
+                    continue
+            candidates.append(name)
+        return candidates
+        
+    def _source_requests(self, old_syms, new_syms, names):
+        """为每个候选符号生成新旧两版的 (file_path, name, line_num) 提取请求"""
+        join = os.path.join
+        old_base, new_base = self._old_base, self._new_base
+        requests = []
+        for name in names:
+            requests.append((join(old_base, old_syms[name]['file']), name, old_syms[name]['line']))
+            requests.append((join(new_base, new_syms[name]['file']), name, new_syms[name]['line']))
+        return requests
+        
+    def _extract_sources(self, old_symbols, new_symbols, max_workers=None):
+        """一次性提取可能修改的函数签名与结构体字段
+        
+        两类请求按文件合并到同一任务中，每个头文件只映射、索引一次
+        返回: ((函数候选, signatures), (结构体候选, fields))
+        """
+        old_funcs, new_funcs = old_symbols['functions'], new_symbols['functions']
+        old_structs, new_structs = old_symbols['structs'], new_symbols['structs']
+        function_names = self._changed_candidates(
+            old_funcs, new_funcs, _partition_symbols(old_funcs, new_funcs)[2])
+        struct_names = self._changed_candidates(
+            old_structs, new_structs, _partition_symbols(old_structs, new_structs)[2])
+        signatures, fields = self.analyzer.extract_sources_parallel(
+            self._source_requests(old_funcs, new_funcs, function_names),
+            self._source_requests(old_structs, new_structs, struct_names),
+            max_workers)
+        return (function_names, signatures), (struct_names, fields)
+        
+    def _analyze_functions(self, old_funcs, new_funcs, sources=None):
         """分析函数变化"""
-        old_names = set(old_funcs.keys())
-        new_names = set(new_funcs.keys())
+        added_names, removed_names, common_names = _partition_symbols(old_funcs, new_funcs)
         
         # 新增的函数
-        for name in new_names - old_names:
-            self.changes['functions'].append({
-                'name': name,
-                'change_type': 'added',
-                'file': new_funcs[name]['file'],
-                'line': new_funcs[name]['line'],
-                'signature': new_funcs[name]['signature']
-            })
+        for name in added_names:
+            self.changes['functions'].append(FunctionChange(
+                name=name,
+                change_type='added',
+                file=new_funcs[name]['file'],
+                line=new_funcs[name]['line'],
+                signature=new_funcs[name]['signature']
+            ))
             
         # 删除的函数
-        for name in old_names - new_names:
-            self.changes['functions'].append({
-                'name': name,
-                'change_type': 'removed',
-                'file': old_funcs[name]['file'],
-                'line': old_funcs[name]['line'],
-                'signature': old_funcs[name]['signature']
-            })
+        for name in removed_names:
+            self.changes['functions'].append(FunctionChange(
+                name=name,
+                change_type='removed',
+                file=old_funcs[name]['file'],
+                line=old_funcs[name]['line'],
+                signature=old_funcs[name]['signature']
+            ))
             
-        # 可能修改的函数
-        for name in old_names & new_names:
+        # 可能修改的函数：按文件分组并行提取完整签名（analyze 中已与结构体一并提取时直接复用）
+        if sources is None:
+            common_names = self._changed_candidates(old_funcs, new_funcs, common_names)
+            requests = self._source_requests(old_funcs, new_funcs, common_names)
+            sources = common_names, self.analyzer.extract_signatures_parallel(requests)
+        common_names, signatures = sources
+        join = os.path.join
+        old_base, new_base = self._old_base, self._new_base
+        
+        parse_params = self.analyzer.parse_function_parameters
+        compare_params = self.analyzer.compare_function_parameters
+        for name in common_names:
             old_func = old_funcs[name]
             new_func = new_funcs[name]
             
-            # 提取完整签名
-            old_file = Path(self.old_kernel) / old_func['file']
-            new_file = Path(self.new_kernel) / new_func['file']
-            
-            old_sig = self.analyzer.extract_function_signature(
-                old_file, name, old_func['line']
-            )
-            new_sig = self.analyzer.extract_function_signature(
-                new_file, name, new_func['line']
-            )
+            old_sig = signatures[join(old_base, old_func['file'])][name]
+            new_sig = signatures[join(new_base, new_func['file'])][name]
             
             if old_sig != new_sig:
                 # 解析参数
-                old_params = self.analyzer.parse_function_parameters(old_sig)
-                new_params = self.analyzer.parse_function_parameters(new_sig)
+                old_params = parse_params(old_sig)
+                new_params = parse_params(new_sig)
                 
-                param_changes = self.analyzer.compare_function_parameters(
-                    old_params, new_params
-                )
+                param_changes = compare_params(old_params, new_params)
                 
                 # 检查返回类型
-                old_return = old_sig.split('(')[0].strip().split()[-1]
-                new_return = new_sig.split('(')[0].strip().split()[-1]
+                old_return = _return_type(old_sig)
+                new_return = _return_type(new_sig)
                 
-                self.changes['functions'].append({
-                    'name': name,
-                    'change_type': 'modified',
-                    'file': new_func['file'],
-                    'old_signature': old_sig,
-                    'new_signature': new_sig,
-                    'old_line': old_func['line'],
-                    'new_line': new_func['line'],
-                    'return_type_changed': old_return != new_return,
-                    'old_return_type': old_return,
-                    'new_return_type': new_return,
-                    'parameter_changes': param_changes
-                })
+                self.changes['functions'].append(FunctionChange(
+                    name=name,
+                    change_type='modified',
+                    file=new_func['file'],
+                    old_signature=old_sig,
+                    new_signature=new_sig,
+                    old_line=old_func['line'],
+                    new_line=new_func['line'],
+                    return_type_changed=old_return != new_return,
+                    old_return_type=old_return,
+                    new_return_type=new_return,
+                    parameter_changes=param_changes
+                ))
                 
-    def _analyze_structs(self, old_structs, new_structs):
+    def _analyze_structs(self, old_structs, new_structs, sources=None):
         """分析结构体变化"""
-        old_names = set(old_structs.keys())
-        new_names = set(new_structs.keys())
+        added_names, removed_names, common_names = _partition_symbols(old_structs, new_structs)
         
         # 新增结构体
-        for name in new_names - old_names:
-            self.changes['structs'].append({
-                'name': name,
-                'change_type': 'added',
-                'file': new_structs[name]['file']
-            })
+        for name in added_names:
+            self.changes['structs'].append(StructChange(
+                name=name,
+                change_type='added',
+                file=new_structs[name]['file']
+            ))
             
         # 删除结构体
-        for name in old_names - new_names:
-            self.changes['structs'].append({
-                'name': name,
-                'change_type': 'removed',
-                'file': old_structs[name]['file']
-            })
+        for name in removed_names:
+            self.changes['structs'].append(StructChange(
+                name=name,
+                change_type='removed',
+                file=old_structs[name]['file']
+            ))
             
-        # 修改的结构体
-        for name in old_names & new_names:
+        # 修改的结构体：按文件分组并行提取字段，每个文件只映射一次（analyze 中已一并提取时直接复用）
+        if sources is None:
+            common_names = self._changed_candidates(old_structs, new_structs, common_names)
+            requests = self._source_requests(old_structs, new_structs, common_names)
+            sources = common_names, self.analyzer.extract_struct_fields_parallel(requests)
+        common_names, fields = sources
+        join = os.path.join
+        old_base, new_base = self._old_base, self._new_base
+        
+        compare_fields = self.analyzer.compare_struct_fields
+        for name in common_names:
             old_struct = old_structs[name]
             new_struct = new_structs[name]
             
-            old_file = Path(self.old_kernel) / old_struct['file']
-            new_file = Path(self.new_kernel) / new_struct['file']
-            
-            old_fields = self.analyzer.extract_struct_fields(
-                old_file, name, old_struct['line']
-            )
-            new_fields = self.analyzer.extract_struct_fields(
-                new_file, name, new_struct['line']
-            )
+            old_fields = fields[join(old_base, old_struct['file'])][name]
+            new_fields = fields[join(new_base, new_struct['file'])][name]
             
             if old_fields != new_fields:
-                field_changes = self.analyzer.compare_struct_fields(
-                    old_fields, new_fields
-                )
+                field_changes = compare_fields(old_fields, new_fields)
                 
-                self.changes['structs'].append({
-                    'name': name,
-                    'change_type': 'modified',
-                    'file': new_struct['file'],
-                    'field_changes': field_changes
-                })
+                self.changes['structs'].append(StructChange(
+                    name=name,
+                    change_type='modified',
+                    file=new_struct['file'],
+                    field_changes=field_changes
+                ))
                 
     def _analyze_macros(self, old_macros, new_macros):
         """分析宏变化"""
-        old_names = set(old_macros.keys())
-        new_names = set(new_macros.keys())
-        
-        for name in new_names - old_names:
-            self.changes['macros'].append({
-                'name': name,
-                'change_type': 'added',
-                'file': new_macros[name]['file']
-            })
+        added_names, removed_names, common_names = _partition_symbols(old_macros, new_macros)
+        
+        for name in added_names:
+            self.changes['macros'].append(MacroChange(
+                name=name,
+                change_type='added',
+                file=new_macros[name]['file']
+            ))
             
-        for name in old_names - new_names:
-            self.changes['macros'].append({
-                'name': name,
-                'change_type': 'removed',
-                'file': old_macros[name]['file']
-            })
+        for name in removed_names:
+            self.changes['macros'].append(MacroChange(
+                name=name,
+                change_type='removed',
+                file=old_macros[name]['file']
+            ))
             
-        for name in old_names & new_names:
+        for name in common_names:
             if old_macros[name]['signature'] != new_macros[name]['signature']:
-                self.changes['macros'].append({
-                    'name': name,
-                    'change_type': 'modified',
-                    'file': new_macros[name]['file'],
-                    'old_definition': old_macros[name]['signature'],
-                    'new_definition': new_macros[name]['signature']
-                })
+                self.changes['macros'].append(MacroChange(
+                    name=name,
+                    change_type='modified',
+                    file=new_macros[name]['file'],
+                    old_definition=old_macros[name]['signature'],
+                    new_definition=new_macros[name]['signature']
+                ))
                 
     def _analyze_typedefs(self, old_types, new_types):
         """分析typedef变化"""
-        old_names = set(old_types.keys())
-        new_names = set(new_types.keys())
-        
-        for name in new_names - old_names:
-            self.changes['typedefs'].append({
-                'name': name,
-                'change_type': 'added',
-                'file': new_types[name]['file']
-            })
+        added_names, removed_names, common_names = _partition_symbols(old_types, new_types)
+        
+        for name in added_names:
+            self.changes['typedefs'].append(ChangeRecord(
+                name=name,
+                change_type='added',
+                file=new_types[name]['file']
+            ))
             
-        for name in old_names - new_names:
-            self.changes['typedefs'].append({
-                'name': name,
-                'change_type': 'removed',
-                'file': old_types[name]['file']
-            })
+        for name in removed_names:
+            self.changes['typedefs'].append(ChangeRecord(
+                name=name,
+                change_type='removed',
+                file=old_types[name]['file']
+            ))
             
     def _generate_summary(self):
         """生成统计摘要"""
         for category in ['functions', 'structs', 'macros', 'typedefs']:
             items = self.changes[category]
+            # 一次遍历统计各变更类型；记录是 slots 数据类，按列用 attrgetter 在 C 层取值，
+            # 不经过 Mapping 接口的 Python 层 __getitem__
+            counts = Counter(map(attrgetter('change_type'), items))
             self.changes['summary'][category] = {
-                'added': len([x for x in items if x['change_type'] == 'added']),
-                'removed': len([x for x in items if x['change_type'] == 'removed']),
-                'modified': len([x for x in items if x['change_type'] == 'modified']),
+                'added': counts['added'],
+                'removed': counts['removed'],
+                'modified': counts['modified'],
                 'total_changes': len(items)
             }
             
     def save_results(self, output_file='kernel_api_changes.json'):
         """保存结果到JSON文件"""
-        with open(output_file, 'w') as f:
-            json.dump(self.changes, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(_json_dumps(self.changes))
         print(f"\n分析完成! 结果已保存到: {output_file}")
 
 def main():
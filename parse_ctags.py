@@ -1,11 +1,58 @@
 #!/usr/bin/env python3
 # parse_ctags.py - 解析ctags JSON输出
 
+import gzip
+import io
 import json
+import mmap
 import re
+import sys
 from collections import defaultdict
 from pathlib import Path
 
+# 优先使用 orjson 直接解析字节，未安装时退回标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 压缩的 tags 文件（tags.json.zst）需要 zstandard；未安装时只支持未压缩和 .gz
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# parse_kernel_tags 按顺序查找的 tags 文件名
+TAGS_FILE_NAMES = ('tags.json', 'tags.json.zst', 'tags.json.gz')
+
+def _iter_candidate_lines(buf, needle=b'include/'):
+    """只产出包含 needle 的行
+    
+    直接用 find 在整个缓冲区上跳到下一处 needle（C 层扫描），再扩展到所在行的边界，
+    不含 needle 的行完全不进入 Python 层循环
+    """
+    pos = buf.find(needle)
+    while pos != -1:
+        start = buf.rfind(b'\n', 0, pos) + 1
+        end = buf.find(b'\n', pos)
+        if end == -1:
+            end = len(buf)
+        yield buf[start:end]
+        pos = buf.find(needle, end)
+
+def _open_compressed(tags_file):
+    """以二进制流打开压缩的 tags 文件，未压缩时返回 None"""
+    suffix = Path(tags_file).suffix
+    if suffix == '.gz':
+        return gzip.open(tags_file, 'rb')
+    if suffix == '.zst':
+        if zstandard is None:
+            raise ImportError(f"读取 {tags_file} 需要安装 zstandard")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(tags_file, 'rb'), closefd=True)
+        return io.BufferedReader(raw, buffer_size=1 << 20)
+    return None
+
 class CTagsParser:
     def __init__(self, tags_file):
         self.tags_file = tags_file
@@ -14,55 +61,76 @@ class CTagsParser:
         self.structs = {}
         self.typedefs = {}
         self.enums = {}
+        # kind -> 目标符号表，一次哈希查找代替 if/elif 链
+        self._by_kind = {
+            'function': self.functions,
+            'macro': self.macros,
+            'struct': self.structs,
+            'typedef': self.typedefs,
+            'enum': self.enums
+        }
         
     def parse(self):
         """解析ctags JSON输出"""
-        with open(self.tags_file, 'r') as f:
-            for line in f:
-                try:
-                    tag = json.loads(line.strip())
-                    self._process_tag(tag)
-                except json.JSONDecodeError:
-                    continue
+        for line in self._candidate_lines():
+            try:
+                tag = _json_loads(line)
+                self._process_tag(tag)
+            except json.JSONDecodeError:  # orjson.JSONDecodeError 是它的子类
+                continue
+                
+    def _candidate_lines(self):
+        """产出可能属于公开 API 的行：路径不含 include/ 的条目必然被 _is_public_api 过滤"""
+        # 压缩文件边解压边按行过滤，不落地完整的解压结果
+        stream = _open_compressed(self.tags_file)
+        if stream is not None:
+            with stream:
+                for line in stream:
+                    if b'include/' in line:
+                        yield line
+            return
+            
+        with open(self.tags_file, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # 空文件无法映射
+                return
+                
+        with mm:
+            yield from _iter_candidate_lines(mm)
                     
     def _process_tag(self, tag):
         """处理单个tag条目"""
-        name = tag.get('name')
-        kind = tag.get('kind')
-        path = tag.get('path')
-        signature = tag.get('signature', '')
-        line = tag.get('line', 0)
-        
+        # 不关心的 kind 直接跳过
+        bucket = self._by_kind.get(tag.get('kind'))
+        if bucket is None:
+            return
+            
         # 过滤非头文件和内部实现
+        path = tag.get('path')
         if not self._is_public_api(path):
             return
             
+        # 文件路径、scope、access 大量重复，名称在新旧两版间重复，统一驻留共享同一对象
+        name = tag.get('name')
+        if isinstance(name, str):
+            name = sys.intern(name)
         tag_info = {
             'name': name,
-            'file': path,
-            'line': line,
-            'signature': signature,
-            'scope': tag.get('scope', ''),
-            'access': tag.get('access', 'public')
+            'file': sys.intern(path),
+            'line': tag.get('line', 0),
+            'signature': tag.get('signature', ''),
+            'scope': sys.intern(tag.get('scope', '')),
+            'access': sys.intern(tag.get('access', 'public'))
         }
-        
-        if kind == 'function':
-            self.functions[name] = tag_info
-        elif kind == 'macro':
-            self.macros[name] = tag_info
-        elif kind == 'struct':
-            self.structs[name] = tag_info
-        elif kind == 'typedef':
-            self.typedefs[name] = tag_info
-        elif kind == 'enum':
-            self.enums[name] = tag_info
+        bucket[name] = tag_info
             
     def _is_public_api(self, path):
         """判断是否为公开API"""
         if not path:
             return False
         # 只分析include目录下的头文件
-        return 'include/' in path and path.endswith('.h')
+        return path.endswith('.h') and 'include/' in path
         
     def get_all_symbols(self):
         """获取所有符号"""
@@ -76,7 +144,9 @@ class CTagsParser:
 
 def parse_kernel_tags(kernel_path):
     """解析内核tags"""
-    tags_file = Path(kernel_path) / "tags.json"
+    # 优先使用未压缩的 tags.json，其次是压缩版本
+    candidates = [Path(kernel_path) / name for name in TAGS_FILE_NAMES]
+    tags_file = next((p for p in candidates if p.exists()), candidates[0])
     parser = CTagsParser(tags_file)
     parser.parse()
     return parser.get_all_symbols()
\ No newline at end of file
@@ -10,6 +10,10 @@ class SubsystemAnalyzer:
         self.old_kernel = old_kernel
         self.new_kernel = new_kernel
         self.subsystems = self._identify_subsystems()
+        self._subsystem_names, self._subsystem_re = self._compile_subsystems()
+        # 文件 -> 子系统 的归类结果，变化数远多于不同文件数，每个文件只归类一次
+        self._file_subsystem = {}
+        self.subsystem_changes = self._new_accumulator()
         
     def _identify_subsystems(self):
         """识别内核子系统"""
@@ -23,69 +27,96 @@ class SubsystemAnalyzer:
             'crypto': 'include/linux/crypto*.h include/crypto/',
         }
         
-    def analyze_subsystem_changes(self, api_changes):
-        """分析子系统级别的变化"""
-        subsystem_changes = defaultdict(lambda: {
+    def _compile_subsystems(self):
+        """把各子系统的路径片段编译成一个正则
+        
+        每个子系统一个分支 `.*?(片段1|片段2)`，分支按子系统顺序尝试，
+        命中的捕获组编号即子系统序号，与逐个子系统做子串判断的结果一致
+        """
+        names = list(self.subsystems)
+        branches = [
+            '.*?(' + '|'.join(map(re.escape, pattern.split())) + ')'
+            for pattern in self.subsystems.values()
+        ]
+        return names, re.compile('(?:' + '|'.join(branches) + ')', re.DOTALL)
+        
+    def _new_accumulator(self):
+        return defaultdict(lambda: {
             'functions': [],
             'structs': [],
             'semantic_changes': []
         })
         
-        for func_change in api_changes['functions']:
-            subsys = self._categorize_file(func_change['file'])
-            if subsys:
-                subsystem_changes[subsys]['functions'].append(func_change)
-                
-        for struct_change in api_changes['structs']:
-            subsys = self._categorize_file(struct_change['file'])
-            if subsys:
-                subsystem_changes[subsys]['structs'].append(struct_change)
+    def analyze_subsystem_changes(self, api_changes):
+        """分析子系统级别的变化"""
+        self.subsystem_changes = self._new_accumulator()
+        
+        for category in ('functions', 'structs'):
+            for change in api_changes[category]:
+                self.visit(category, change)
                 
-        # 检测语义变化模式
-        for subsys, changes in subsystem_changes.items():
+        return self.finalize()
+        
+    def visit(self, category, change):
+        """归类单条变化（可与其他分析器共享同一次遍历）"""
+        if category not in ('functions', 'structs'):
+            return
+        file_path = change['file']
+        subsys = self._file_subsystem.get(file_path)
+        if subsys is None:
+            subsys = self._file_subsystem[file_path] = self._categorize_file(file_path)
+        if subsys:
+            self.subsystem_changes[subsys][category].append(change)
+            
+    def finalize(self):
+        """检测语义变化模式并返回子系统分析结果"""
+        for subsys, changes in self.subsystem_changes.items():
             semantic = self._detect_semantic_patterns(subsys, changes)
-            subsystem_changes[subsys]['semantic_changes'] = semantic
+            self.subsystem_changes[subsys]['semantic_changes'] = semantic
             
-        return dict(subsystem_changes)
+        return dict(self.subsystem_changes)
         
     def _categorize_file(self, file_path):
         """将文件归类到子系统"""
-        for subsys, pattern in self.subsystems.items():
-            if any(p in file_path for p in pattern.split()):
-                return subsys
+        match = self._subsystem_re.match(file_path)
+        if match:
+            return self._subsystem_names[match.lastindex - 1]
         return 'other'
         
     def _detect_semantic_patterns(self, subsys, changes):
         """检测语义变化模式"""
         patterns = []
         
-        # 检测参数添加模式
-        func_changes = changes['functions']
-        param_additions = [f for f in func_changes 
-                          if f.get('change_type') == 'modified' 
-                          and any(p['type'] == 'param_added' 
-                                 for p in f.get('parameter_changes', []))]
+        # 检测参数添加模式：一次遍历直接收集函数名
+        param_additions = []
+        for f in changes['functions']:
+            if f.get('change_type') != 'modified':
+                continue
+            for p in f.get('parameter_changes', ()):
+                if p['type'] == 'param_added':
+                    param_additions.append(f['name'])
+                    break
         
         if len(param_additions) > 5:
             patterns.append({
                 'pattern': 'widespread_parameter_addition',
                 'description': f'{len(param_additions)} functions had parameters added',
                 'impact': 'API extension',
-                'affected_functions': [f['name'] for f in param_additions]
+                'affected_functions': param_additions
             })
             
         # 检测结构体扩展模式
-        struct_changes = changes['structs']
-        extended_structs = [s for s in struct_changes
-                           if s.get('change_type') == 'modified'
-                           and len(s.get('field_changes', {}).get('added', [])) > 0]
+        extended_structs = [
+            s['name'] for s in changes['structs']
+            if s.get('change_type') == 'modified' and s.get('field_changes', {}).get('added')
+        ]
         
         if len(extended_structs) > 3:
             patterns.append({
                 'pattern': 'data_structure_evolution',
                 'description': f'{len(extended_structs)} structures were extended',
                 'impact': 'ABI potentially affected',
-                'affected_structs': [s['name'] for s in extended_structs]
+                'affected_structs': extended_structs
             })
             
         return patterns
\ No newline at end of file
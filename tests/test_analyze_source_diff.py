@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# tests/test_analyze_source_diff.py - 源码差异提取的回归测试
+
+import os
+import tempfile
+import unittest
+
+from analyze_source_diff import FunctionChange, SourceDiffAnalyzer, StructChange, _line_index
+
+
+class StructFieldsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(_line_index.cache_clear)
+        self.dir = tmp.name
+        self.analyzer = SourceDiffAnalyzer(self.dir, self.dir)
+
+    def _write(self, text):
+        path = os.path.join(self.dir, 'test.h')
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_header_is_word_bounded(self):
+        """'struct foo_bar {' 不能被当作 'struct foo' 的开头"""
+        path = self._write(
+            "struct foo_bar {\n"
+            "\tint wrong;\n"
+            "};\n"
+            "\n"
+            "struct foo {\n"
+            "\tint right;\n"
+            "\tlong other;\n"
+            "};\n"
+        )
+        self.assertEqual(self.analyzer.extract_struct_fields(path, 'foo', 1),
+                         ['int right', 'long other'])
+
+    def test_nested_braces(self):
+        """嵌套的 union/struct 不会提前结束结构体"""
+        path = self._write(
+            "struct foo {\n"
+            "\tunion {\n"
+            "\t\tint a;\n"
+            "\t\tlong b;\n"
+            "\t};\n"
+            "\tint tail;\n"
+            "};\n"
+            "int after;\n"
+        )
+        fields = self.analyzer.extract_struct_fields(path, 'foo', 1)
+        self.assertIn('int tail', fields)
+        self.assertNotIn('int after', fields)
+
+
+class ChangeRecordTest(unittest.TestCase):
+    def setUp(self):
+        self.record = FunctionChange(name='foo', change_type='added', file='include/a.h', line=3)
+
+    def test_only_set_fields_visible(self):
+        self.assertEqual(dict(self.record),
+                         {'name': 'foo', 'change_type': 'added', 'file': 'include/a.h', 'line': 3})
+        self.assertNotIn('signature', self.record)
+        self.assertIsNone(self.record.get('signature'))
+
+    def test_attributes_not_exposed(self):
+        """方法与双下划线属性不能通过字典接口访问"""
+        for key in ('get', 'keys', '__class__', '__slots__'):
+            self.assertNotIn(key, self.record)
+            with self.assertRaises(KeyError):
+                self.record[key]
+
+    def test_equal_to_dict(self):
+        """记录与它替代的字典相等"""
+        as_dict = {'name': 'foo', 'change_type': 'added', 'file': 'include/a.h', 'line': 3}
+        self.assertEqual(self.record, as_dict)
+        self.assertEqual(as_dict, self.record)
+        self.assertNotEqual(StructChange(name='foo', change_type='added', file='include/a.h'), as_dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
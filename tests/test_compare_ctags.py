@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# tests/test_compare_ctags.py - Regression tests for compare_ctags.py
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import compare_ctags
+
+
+def _tag(name, signature, path='include/linux/test.h'):
+    return {"_type": "tag", "name": name, "path": path, "kind": "function",
+            "typeref": "typename:int", "signature": signature}
+
+
+# Version A and B list their symbols in non-alphabetical ctags order
+TAGS_A = [_tag('zeta', '(int)'), _tag('beta', '(int)'), _tag('gamma', '(int)'),
+          _tag('alpha', '(int)')]
+TAGS_B = [_tag('gamma', '(long)'), _tag('omega', '(int)'), _tag('alpha', '(long)'),
+          _tag('delta', '(int)'), _tag('zeta', '(int)')]
+
+
+class NoSortTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.file_a = self._write('a.json', TAGS_A)
+        self.file_b = self._write('b.json', TAGS_B)
+
+    def _write(self, name, tags):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as f:
+            for tag in tags:
+                f.write(json.dumps(tag) + '\n')
+        return path
+
+    def _run(self, *extra):
+        """Runs main() and returns the report keys in file order."""
+        output = os.path.join(self.dir, 'out.json')
+        argv = ['compare_ctags.py', self.file_a, 'v1', self.file_b, 'v2', '-o', output, *extra]
+        with mock.patch.object(sys, 'argv', argv), \
+                contextlib.redirect_stderr(io.StringIO()):
+            compare_ctags.main()
+        with open(output) as f:
+            return list(json.load(f))
+
+    def test_sorted_by_default(self):
+        self.assertEqual(self._run(), ['alpha', 'beta', 'delta', 'gamma', 'omega'])
+
+    def test_no_sort_keeps_ctags_order(self):
+        """Removed, then modified in version A order, then added in version B order."""
+        self.assertEqual(self._run('--no-sort'), ['beta', 'gamma', 'alpha', 'omega', 'delta'])
+
+    def test_same_entries(self):
+        sorted_keys = self._run()
+        self.assertEqual(sorted(self._run('--no-sort')), sorted_keys)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# tests/test_comprehensive_analyzer.py - 共享遍历与各分析器单独运行结果一致的回归测试
+
+import unittest
+
+from abi_impact_analyzer import ABIImpactAnalyzer
+from analyze_source_diff import FunctionChange, StructChange
+from kernel_api_analyzer import KernelAPIAnalyzer
+from subsystem_analyzer import SubsystemAnalyzer
+
+
+class FusedTraversalTest(unittest.TestCase):
+    def setUp(self):
+        self.api = KernelAPIAnalyzer('old', 'new')
+        self.api.changes['functions'].append(FunctionChange(
+            name='alloc_page', change_type='modified', file='include/linux/mm.h',
+            old_signature='int alloc_page(int a)', new_signature='long alloc_page(int a)',
+            return_type_changed=True, parameter_changes=[]))
+        self.api.changes['structs'].append(StructChange(
+            name='sk_buff', change_type='modified', file='include/net/sock.h',
+            field_changes={'removed': ['int len'], 'added': [], 'modified': []}))
+
+    def _fused(self):
+        """与 comprehensive_analyzer 相同的共享遍历"""
+        subsys = SubsystemAnalyzer('old', 'new')
+        abi = ABIImpactAnalyzer(self.api.changes)
+        for category, change in self.api.iter_changes():
+            subsys.visit(category, change)
+            abi.visit(category, change)
+        return subsys.finalize(), abi.generate_abi_report()
+
+    def test_subsystem_order_matches_standalone(self):
+        standalone = SubsystemAnalyzer('old', 'new').analyze_subsystem_changes(self.api.changes)
+        fused, _ = self._fused()
+        self.assertEqual(list(fused), list(standalone))
+        self.assertEqual(fused, standalone)
+
+    def test_abi_order_matches_standalone(self):
+        standalone = ABIImpactAnalyzer(self.api.changes)
+        standalone.analyze_abi_impact()
+        _, fused = self._fused()
+        self.assertEqual(fused, standalone.generate_abi_report())
+        self.assertEqual([c['type'] for c in fused['changes']], ['structure', 'function'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# tests/test_generate_csv_html_report.py - Regression tests for generate_csv_html_report.py
+
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import generate_csv_html_report as report
+
+
+DATA = {
+    'dma_map_single': {'change_type': 'modified', 'old_signature': '(struct device *dev, void *ptr)',
+                       'new_signature': '(struct device *dev, void *ptr, size_t size)',
+                       'semantic_change': 'Adds "size", see\ndocs'},
+    'kfree': {'change_type': 'removed', 'old_kind': 'function', 'line': 12},
+    'kmalloc': {'change_type': 'added', 'new_signature': None},
+}
+
+
+class CsvReportTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _write(self, name, use_arrow):
+        path = os.path.join(self.dir, name)
+        patches = contextlib.ExitStack()
+        with patches:
+            if not use_arrow:
+                patches.enter_context(mock.patch.object(report, 'pa', None))
+            patches.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            self.assertTrue(report.generate_csv_report(DATA, path))
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_csv_module_dialect(self):
+        """The fallback writes an unquoted header and CRLF row endings."""
+        data = self._write('plain.csv', use_arrow=False)
+        self.assertTrue(data.startswith(b'symbol,change_type,old_signature,new_signature,'))
+        self.assertTrue(data.endswith(b'\r\n'))
+
+    @unittest.skipUnless(report.pa is not None and report._arrow_write_options() is not None,
+                         'pyarrow with WriteOptions(eol=...) is not installed')
+    def test_arrow_matches_csv_module(self):
+        arrow = self._write('arrow.csv', use_arrow=True)
+        plain = self._write('plain.csv', use_arrow=False)
+
+        # Same header line, byte for byte
+        self.assertEqual(arrow.split(b'\r\n', 1)[0], plain.split(b'\r\n', 1)[0])
+        # Same CRLF row endings (the embedded newline in a cell stays a bare LF)
+        self.assertTrue(arrow.endswith(b'\r\n'))
+        self.assertEqual(arrow.count(b'\r\n'), plain.count(b'\r\n'))
+        # Quoting may differ, but csv.reader must see identical rows
+        read = lambda raw: list(csv.reader(io.StringIO(raw.decode('utf-8'), newline='')))
+        self.assertEqual(read(arrow), read(plain))
+
+
+if __name__ == '__main__':
+    unittest.main()
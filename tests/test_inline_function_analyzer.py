@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# tests/test_inline_function_analyzer.py - 内联函数扫描的回归测试
+
+import unittest
+
+from inline_function_analyzer import _body_hash, _iter_inline_functions
+
+
+class InlineBodyTest(unittest.TestCase):
+    def test_nested_braces(self):
+        """函数体内嵌套的花括号不会提前结束定义"""
+        buf = (
+            b"static inline int foo(int x)\n"
+            b"{\n"
+            b"\tif (x) {\n"
+            b"\t\twhile (x--) { bar(); }\n"
+            b"\t}\n"
+            b"\treturn x;\n"
+            b"}\n"
+            b"static inline void baz(void) { }\n"
+        )
+        functions = dict(_iter_inline_functions(buf))
+        self.assertEqual(list(functions), [b'foo', b'baz'])
+        self.assertTrue(functions[b'foo'].endswith(b'\treturn x;\n}'))
+
+    def test_braces_in_strings_and_comments(self):
+        """字符串、字符常量和注释里的花括号不参与配对"""
+        buf = (
+            b"static inline void foo(void)\n"
+            b"{\n"
+            b"\tputs(\"}\"); /* } */ // }\n"
+            b"\tchar c = '}';\n"
+            b"}\n"
+        )
+        (name, definition), = _iter_inline_functions(buf)
+        self.assertEqual(name, b'foo')
+        self.assertTrue(definition.endswith(b"char c = '}';\n}"))
+
+    def test_unterminated_body_skipped(self):
+        """函数体到文件末尾都没有闭合时只跳过这个开头，后面完整的定义仍能找到"""
+        buf = (
+            b"static inline int ok(void) { return 1; }\n"
+            b"static inline int broken(void) {\n"
+            b"\tif (x) {\n"
+            b"static inline int later(void) { return 2; }\n"
+        )
+        self.assertEqual([name for name, _ in _iter_inline_functions(buf)], [b'ok', b'later'])
+
+    def test_unbalanced_preprocessor_arms(self):
+        """#ifdef/#else 两个分支各开一个 '{' 时，后续的内联函数不能被吞掉"""
+        buf = (
+            b"static inline int foo(int a)\n"
+            b"{\n"
+            b"#ifdef CONFIG_X\n"
+            b"\tif (a) {\n"
+            b"#else\n"
+            b"\tif (a) {\n"
+            b"#endif\n"
+            b"\t\treturn 1;\n"
+            b"\t}\n"
+            b"\treturn 0;\n"
+            b"}\n"
+            b"static inline int bar(void) { return 2; }\n"
+            b"static inline int baz(void) { return 3; }\n"
+        )
+        names = [name for name, _ in _iter_inline_functions(buf)]
+        self.assertEqual(names[-2:], [b'bar', b'baz'])
+
+
+class BodyHashTest(unittest.TestCase):
+    def test_comments_and_whitespace_ignored(self):
+        self.assertEqual(
+            _body_hash(b"{ f(1); /* note */\n\treturn 0; // done\n}"),
+            _body_hash(b"{ f(1);\n return 0;\n}"),
+        )
+
+    def test_comment_markers_in_strings_kept(self):
+        """字符串里的 '//' 不是注释，同一行后面的改动必须改变哈希"""
+        self.assertNotEqual(
+            _body_hash(b'{ pr_info("see http://x"); g(1); }'),
+            _body_hash(b'{ pr_info("see http://x"); g(2); }'),
+        )
+        self.assertNotEqual(
+            _body_hash(b"{ c = '/'; d = '/'; g(1); }"),
+            _body_hash(b"{ c = '/'; d = '/'; g(2); }"),
+        )
+
+    def test_string_contents_kept(self):
+        """字符串内的空白与注释样式文本属于语义"""
+        self.assertNotEqual(_body_hash(b'{ s = "a  b"; }'), _body_hash(b'{ s = "a b"; }'))
+        self.assertNotEqual(_body_hash(b'{ s = "/* x */"; }'), _body_hash(b'{ s = " "; }'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# tests/test_kernel_api_analyzer.py - API 变化分析的回归测试
+
+import os
+import tempfile
+import unittest
+
+from kernel_api_analyzer import KernelAPIAnalyzer, _return_type
+
+
+class ReturnTypeTest(unittest.TestCase):
+    def test_plain(self):
+        self.assertEqual(_return_type('int foo(int a)'), 'int')
+
+    def test_not_function_name(self):
+        """返回类型是函数名之前的部分，而不是函数名本身"""
+        self.assertEqual(_return_type('unsigned long foo(void)'), 'unsigned long')
+
+    def test_qualifiers_dropped(self):
+        self.assertEqual(_return_type('static inline void *foo(struct page *page)'), 'void *')
+        self.assertEqual(_return_type('extern const char *bar(void)'), 'const char *')
+
+    def test_change_detected(self):
+        self.assertNotEqual(_return_type('int foo(void)'), _return_type('long foo(void)'))
+
+    def test_unrecognised(self):
+        """括号前没有内容时返回空串而不是抛出 IndexError"""
+        self.assertEqual(_return_type('(void)'), '')
+        self.assertEqual(_return_type(''), '')
+
+
+class ChangedCandidatesTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.old = os.path.join(tmp.name, 'old')
+        self.new = os.path.join(tmp.name, 'new')
+        self._write(self.old, 'include/same.h', 'int a(void);\nint b(void);\n')
+        self._write(self.new, 'include/same.h', 'int a(void);\nint b(void);\n')
+        self._write(self.old, 'include/diff.h', 'int c(void);\n')
+        self._write(self.new, 'include/diff.h', 'long c(void);\n')
+        self.analyzer = KernelAPIAnalyzer(self.old, self.new)
+
+    def _write(self, root, rel, text):
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def _candidates(self, old_syms, new_syms):
+        common = sorted(old_syms.keys() & new_syms.keys())
+        return self.analyzer._changed_candidates(old_syms, new_syms, common)
+
+    def test_unchanged_file_skipped(self):
+        """同一行号且两版文件内容相同的符号不再提取"""
+        syms = {'a': {'file': 'include/same.h', 'line': 1},
+                'b': {'file': 'include/same.h', 'line': 2}}
+        self.assertEqual(self._candidates(syms, dict(syms)), [])
+
+    def test_changed_file_kept(self):
+        """行号相同但文件内容不同（如只改了返回类型）仍需提取"""
+        syms = {'c': {'file': 'include/diff.h', 'line': 1}}
+        self.assertEqual(self._candidates(syms, dict(syms)), ['c'])
+
+    def test_moved_or_missing_kept(self):
+        """行号变化或文件无法读取时仍需提取"""
+        old_syms = {'a': {'file': 'include/same.h', 'line': 1},
+                    'x': {'file': 'include/gone.h', 'line': 1}}
+        new_syms = {'a': {'file': 'include/same.h', 'line': 2},
+                    'x': {'file': 'include/gone.h', 'line': 1}}
+        self.assertEqual(self._candidates(old_syms, new_syms), ['a', 'x'])
+
+
+if __name__ == '__main__':
+    unittest.main()